@@ -5,18 +5,44 @@ from copy import deepcopy
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import Platform, ATTR_SW_VERSION, CONF_MAC
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.dispatcher import async_dispatcher_send
 
-from .const import DOMAIN, LOGGER
+from .const import (
+    CONF_ENTRY_TYPE,
+    DOMAIN,
+    ENTRY_TYPE_AGGREGATE,
+    ENTRY_TYPE_DEVICE,
+    LOGGER,
+    SETUP_RETRIES_KEY,
+    SIGNAL_COORDINATORS_CHANGED,
+)
 from .coordinator import TinycontrolCoordinator
+from .energy import async_remove_energy
+from .entity import async_remove_compacted_entities
+from .metrics import async_setup_metrics
 from .services import async_setup_services, async_unload_services
+from .websocket import async_setup_websocket
 
-PLATFORMS = [Platform.SENSOR, Platform.SWITCH, Platform.BINARY_SENSOR]
+PLATFORMS = [
+    Platform.SENSOR,
+    Platform.SWITCH,
+    Platform.BINARY_SENSOR,
+    Platform.NUMBER,
+]
+AGGREGATE_PLATFORMS = [Platform.SENSOR]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up tinycontrol device from a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE) == ENTRY_TYPE_AGGREGATE:
+        await hass.config_entries.async_forward_entry_setups(entry, AGGREGATE_PLATFORMS)
+        return True
+
     coordinator = TinycontrolCoordinator(hass, entry)
-    await coordinator.async_config_entry_first_refresh()
+    await coordinator.async_fast_first_refresh()
+    coordinator.async_start_sampling()
+    coordinator.async_start_input_watcher()
+    coordinator.async_start_export()
 
     # Update config entry because of SW change.
     if coordinator.data.software_version != entry.data[ATTR_SW_VERSION]:
@@ -32,16 +58,44 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
         hass.config_entries.async_update_entry(entry, data=new_data)
 
     hass.data.setdefault(DOMAIN, {})[entry.entry_id] = coordinator
+    async_remove_compacted_entities(coordinator)
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    async_dispatcher_send(hass, SIGNAL_COORDINATORS_CHANGED)
 
     await async_setup_services(hass)
+    async_setup_metrics(hass)
+    async_setup_websocket(hass)
+
+    entry.async_on_unload(entry.add_update_listener(async_reload_entry))
 
     return True
 
 
+async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Reload tinycontrol device config entry after options change."""
+    coordinator = hass.data[DOMAIN].get(entry.entry_id)
+    if coordinator is not None and coordinator.options == entry.options:
+        # Only data has changed (eg. software version), entities follow it anyway.
+        return
+    await hass.config_entries.async_reload(entry.entry_id)
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload tinycontrol device config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE) == ENTRY_TYPE_AGGREGATE:
+        return await hass.config_entries.async_unload_platforms(
+            entry, AGGREGATE_PLATFORMS
+        )
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
         del hass.data[DOMAIN][entry.entry_id]
+        async_dispatcher_send(hass, SIGNAL_COORDINATORS_CHANGED)
     await async_unload_services(hass, unload_ok)
     return unload_ok
+
+
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Remove data stored for tinycontrol device config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE) == ENTRY_TYPE_AGGREGATE:
+        return
+    hass.data.get(SETUP_RETRIES_KEY, set()).discard(entry.entry_id)
+    await async_remove_energy(hass, entry.entry_id)
@@ -0,0 +1,196 @@
+"""Aggregate sensors computed from readings of many tinycontrol devices.
+
+Aggregate is set up as a separate config entry (eg. total pActive of tcPDUs
+in an area, max of ds* per floor). It listens to coordinators directly and
+updates its value from the device that has changed, without reading states.
+"""
+
+from fnmatch import fnmatchcase
+from functools import partial
+from typing import Any
+
+from homeassistant.components.sensor import SensorEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_NAME
+from homeassistant.core import CALLBACK_TYPE, Event, callback
+from homeassistant.helpers import area_registry as ar, device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import (
+    AGGREGATE_MAX,
+    AGGREGATE_MEAN,
+    AGGREGATE_MIN,
+    AGGREGATE_SUM,
+    CONF_AREA,
+    CONF_FLOOR,
+    CONF_FUNCTION,
+    CONF_KEYS,
+    DOMAIN,
+    SIGNAL_COORDINATORS_CHANGED,
+)
+from .coordinator import TinycontrolCoordinator, async_get_coordinators
+
+ATTR_DEVICES = "devices"
+
+
+class TinycontrolAggregateSensor(SensorEntity):
+    """Sensor aggregating readings of tinycontrol devices."""
+
+    _attr_should_poll = False
+
+    def __init__(self, entry: ConfigEntry, description: Any | None) -> None:
+        """Initialize aggregate sensor.
+
+        Description of sensor matching the keys (if any) provides unit, etc.
+        """
+        self._attr_unique_id = entry.entry_id
+        self._attr_name = entry.data[CONF_NAME]
+        if description is not None:
+            self._attr_device_class = description.device_class
+            self._attr_native_unit_of_measurement = (
+                description.native_unit_of_measurement
+            )
+            self._attr_suggested_display_precision = (
+                description.suggested_display_precision
+            )
+            self._attr_state_class = description.state_class
+        self._pattern: str = entry.data[CONF_KEYS]
+        self._function: str = entry.data[CONF_FUNCTION]
+        self._area: str | None = entry.data.get(CONF_AREA)
+        self._floor: str | None = entry.data.get(CONF_FLOOR)
+        # Contribution of each device (by entry_id) - total and count of values.
+        self._contributions: dict[str, tuple[float, int]] = {}
+        self._total = 0.0
+        self._count = 0
+        # Matching keys of each device, with keys version they were found for.
+        self._device_keys: dict[str, tuple[int, list[str]]] = {}
+        self._attr_extra_state_attributes = {ATTR_DEVICES: 0}
+        self._unsub_coordinators: list[CALLBACK_TYPE] = []
+
+    async def async_added_to_hass(self) -> None:
+        """Subscribe to coordinators and changes of devices."""
+        self.async_on_remove(
+            async_dispatcher_connect(
+                self.hass, SIGNAL_COORDINATORS_CHANGED, self._async_subscribe
+            )
+        )
+        self.async_on_remove(
+            self.hass.bus.async_listen(
+                dr.EVENT_DEVICE_REGISTRY_UPDATED,
+                self._async_device_updated,
+                event_filter=self._filter_device_updated,
+            )
+        )
+        self.async_on_remove(self._async_unsubscribe)
+        self._async_subscribe()
+
+    @callback
+    def _filter_device_updated(self, event_data: dict[str, Any]) -> bool:
+        """Check if area of a device has changed."""
+        return event_data["action"] == "update" and "area_id" in event_data.get(
+            "changes", {}
+        )
+
+    @callback
+    def _async_device_updated(self, _event: Event) -> None:
+        """Handle change of device area."""
+        self._async_subscribe()
+
+    @callback
+    def _async_unsubscribe(self) -> None:
+        """Unsubscribe from all coordinators."""
+        for unsub in self._unsub_coordinators:
+            unsub()
+        self._unsub_coordinators.clear()
+        self._contributions.clear()
+        self._device_keys.clear()
+        self._total = 0.0
+        self._count = 0
+
+    @callback
+    def _async_subscribe(self) -> None:
+        """Subscribe to updates of all coordinators in scope of the aggregate."""
+        self._async_unsubscribe()
+        for coordinator in async_get_coordinators(self.hass):
+            if not self._in_scope(coordinator):
+                continue
+            self._unsub_coordinators.append(
+                coordinator.async_add_listener(
+                    partial(self._async_handle_update, coordinator)
+                )
+            )
+            self._update_contribution(coordinator)
+        self._async_write_value()
+
+    def _in_scope(self, coordinator: TinycontrolCoordinator) -> bool:
+        """Check if device of coordinator is in area/floor of the aggregate."""
+        if self._area is None and self._floor is None:
+            return True
+        device = dr.async_get(self.hass).async_get_device(
+            identifiers={(DOMAIN, coordinator.data.mac)}
+        )
+        if device is None or device.area_id is None:
+            return False
+        if self._area is not None and device.area_id != self._area:
+            return False
+        if self._floor is not None:
+            area = ar.async_get(self.hass).async_get_area(device.area_id)
+            return area is not None and area.floor_id == self._floor
+        return True
+
+    @callback
+    def _async_handle_update(self, coordinator: TinycontrolCoordinator) -> None:
+        """Update aggregate with new data of a single device."""
+        self._update_contribution(coordinator)
+        self._async_write_value()
+
+    def _update_contribution(self, coordinator: TinycontrolCoordinator) -> None:
+        """Replace contribution of device in running totals."""
+        entry_id = coordinator.config_entry.entry_id
+        total, count = self._contributions.pop(entry_id, (0.0, 0))
+        self._total -= total
+        self._count -= count
+        if not coordinator.last_update_success or coordinator.data is None:
+            return
+        state = coordinator.data.state
+        keys_version, keys = self._device_keys.get(entry_id, (None, []))
+        if keys_version != coordinator.keys_version:
+            keys = [key for key in state if fnmatchcase(key, self._pattern)]
+            self._device_keys[entry_id] = (coordinator.keys_version, keys)
+        values = [
+            value for key in keys if isinstance(value := state.get(key), (int, float))
+        ]
+        if not values:
+            return
+        if self._function == AGGREGATE_MAX:
+            contribution = (max(values), 1)
+        elif self._function == AGGREGATE_MIN:
+            contribution = (min(values), 1)
+        else:
+            contribution = (sum(values), len(values))
+        self._contributions[entry_id] = contribution
+        self._total += contribution[0]
+        self._count += contribution[1]
+
+    @callback
+    def _async_write_value(self) -> None:
+        """Write state if aggregated value has changed."""
+        value: float | None = None
+        if self._contributions:
+            if self._function == AGGREGATE_SUM:
+                value = self._total
+            elif self._function == AGGREGATE_MEAN:
+                value = self._total / self._count
+            elif self._function == AGGREGATE_MAX:
+                value = max(total for total, _ in self._contributions.values())
+            else:
+                value = min(total for total, _ in self._contributions.values())
+        devices = len(self._contributions)
+        if (
+            value == self._attr_native_value
+            and devices == self._attr_extra_state_attributes[ATTR_DEVICES]
+        ):
+            return
+        self._attr_native_value = value
+        self._attr_extra_state_attributes = {ATTR_DEVICES: devices}
+        self.async_write_ha_state()
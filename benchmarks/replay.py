@@ -0,0 +1,111 @@
+"""Benchmark coordinator updates against recorded device responses.
+
+Capture recorded by the integration (option "Record HTTP exchanges", files in
+<config>/tinycontrol_captures/) is served by local replay server and
+coordinator is refreshed given number of times, so performance of updates can
+be compared between versions without real devices.
+
+Run in Home Assistant environment (with tinytoolslib installed), eg.:
+
+    python benchmarks/replay.py capture.json --updates 200 --speed 0
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_HW_VERSION,
+    ATTR_SW_VERSION,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+
+INTEGRATION_DIR = Path(__file__).resolve().parents[1]
+MAC = "02:00:00:00:00:01"
+
+
+async def async_main(path: Path, updates: int, speed: float) -> None:
+    """Refresh coordinator against replayed capture and print results."""
+    sys.path.insert(0, str(INTEGRATION_DIR.parent))
+    capture_module = importlib.import_module(f"{INTEGRATION_DIR.name}.capture")
+    coordinator_module = importlib.import_module(f"{INTEGRATION_DIR.name}.coordinator")
+    capture = capture_module.load_capture(path)
+    server = capture_module.TinycontrolReplayServer(capture, speed)
+    port = await server.async_start()
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        entry = ConfigEntry(
+            domain=coordinator_module.DOMAIN,
+            title="Replay",
+            data={
+                CONF_HOST: "127.0.0.1",
+                CONF_PORT: port,
+                CONF_USERNAME: "",
+                CONF_PASSWORD: "",
+                CONF_MAC: MAC,
+                ATTR_HW_VERSION: capture["hardware_version"],
+                ATTR_SW_VERSION: capture["software_version"],
+                CONF_SCAN_INTERVAL: 30,
+            },
+            options={},
+            source="user",
+            version=1,
+            minor_version=1,
+            unique_id=MAC,
+            discovery_keys=MappingProxyType({}),
+            subentries_data=None,
+        )
+        coordinator = coordinator_module.TinycontrolCoordinator(hass, entry)
+        latencies = []
+        start = time.perf_counter()
+        for _ in range(updates):
+            await coordinator.async_refresh()
+            if not coordinator.last_update_success:
+                print(f"Update failed: {coordinator.last_exception}")
+                break
+            latencies.append(coordinator.poll_latency)
+        elapsed = time.perf_counter() - start
+        await coordinator.async_shutdown()
+        await hass.async_stop(force=True)
+    await server.async_stop()
+    print(
+        f"{capture['model']} {capture['hardware_version']}/"
+        f"{capture['software_version']}: {len(latencies)} updates in {elapsed:.2f} s"
+    )
+    if len(latencies) > 1:
+        print(
+            f"  update latency mean {statistics.fmean(latencies) * 1000:.1f} ms, "
+            f"p95 {statistics.quantiles(latencies, n=20)[-1] * 1000:.1f} ms"
+        )
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--updates", type=int, default=100)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=1.0,
+        help="multiplier of recorded response time (0 - as fast as possible)",
+    )
+    args = parser.parse_args()
+    asyncio.run(async_main(args.capture, args.updates, args.speed))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark setup of many tinycontrol config entries.
+
+Sets up N simulated devices concurrently (as Home Assistant does at startup)
+and reports wall time of setting up all entries. Simulated devices are the
+ones that slow down startup - devices that are down (address from TEST-NET-1,
+connection hangs) and devices that refuse connections (closed local port).
+
+Run in Home Assistant environment (with tinytoolslib installed), eg.:
+
+    python benchmarks/setup_entries.py --devices 200 --down 0.5
+"""
+
+import argparse
+import asyncio
+import importlib
+import socket
+import sys
+import tempfile
+import time
+from collections import Counter
+from pathlib import Path
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import (
+    ATTR_HW_VERSION,
+    ATTR_SW_VERSION,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import ConfigEntryNotReady
+
+INTEGRATION_DIR = Path(__file__).resolve().parents[1]
+# LK4 with status API.
+HARDWARE_VERSION = "4.0"
+SOFTWARE_VERSION = "1.37"
+
+
+def get_closed_port() -> int:
+    """Return local port that refuses connections."""
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def create_entry(domain: str, index: int, host: str, port: int) -> ConfigEntry:
+    """Create config entry of simulated device."""
+    mac = f"02:00:00:00:{index // 256:02x}:{index % 256:02x}"
+    return ConfigEntry(
+        domain=domain,
+        title=f"Simulated {index}",
+        data={
+            CONF_HOST: host,
+            CONF_PORT: port,
+            CONF_USERNAME: "",
+            CONF_PASSWORD: "",
+            CONF_MAC: mac,
+            ATTR_HW_VERSION: HARDWARE_VERSION,
+            ATTR_SW_VERSION: SOFTWARE_VERSION,
+            CONF_SCAN_INTERVAL: 30,
+        },
+        options={},
+        source="user",
+        version=1,
+        minor_version=1,
+        unique_id=mac,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+
+
+async def async_setup(hass: HomeAssistant, integration, entry: ConfigEntry) -> str:
+    """Set up entry and return its resulting state."""
+    # Entry state is set by config entries manager in real setup.
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    try:
+        await integration.async_setup_entry(hass, entry)
+    except ConfigEntryNotReady:
+        return ConfigEntryState.SETUP_RETRY.value
+    except Exception:  # noqa: BLE001
+        return ConfigEntryState.SETUP_ERROR.value
+    return ConfigEntryState.LOADED.value
+
+
+async def async_main(devices: int, down: float) -> None:
+    """Set up simulated devices and print results."""
+    sys.path.insert(0, str(INTEGRATION_DIR.parent))
+    integration = importlib.import_module(INTEGRATION_DIR.name)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        closed_port = get_closed_port()
+        entries = [
+            (
+                create_entry(
+                    integration.DOMAIN, index, f"192.0.2.{index % 254 + 1}", 80
+                )
+                if index < devices * down
+                else create_entry(integration.DOMAIN, index, "127.0.0.1", closed_port)
+            )
+            for index in range(devices)
+        ]
+        start = time.perf_counter()
+        states = await asyncio.gather(
+            *(async_setup(hass, integration, entry) for entry in entries)
+        )
+        elapsed = time.perf_counter() - start
+        print(f"Set up {devices} devices ({down:.0%} down) in {elapsed:.2f} s")
+        for state, count in Counter(states).most_common():
+            print(f"  {state}: {count}")
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--devices", type=int, default=100)
+    parser.add_argument(
+        "--down", type=float, default=0.5, help="part of devices that are down"
+    )
+    args = parser.parse_args()
+    asyncio.run(async_main(args.devices, args.down))
+
+
+if __name__ == "__main__":
+    main()
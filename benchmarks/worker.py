@@ -0,0 +1,176 @@
+"""Benchmark event loop lag of updates with and without worker mode.
+
+Many coordinators are refreshed concurrently against recorded device responses
+(capture saved with option "Record HTTP exchanges"), once with reads in main
+event loop and once in worker thread. Meanwhile lag of main event loop is
+measured (delay of short sleeps over their duration). Replay server runs in
+its own thread, so it doesn't load main event loop in either mode.
+
+Run in Home Assistant environment (with tinytoolslib installed), eg.:
+
+    python benchmarks/worker.py capture.json --devices 500 --rounds 20
+"""
+
+import argparse
+import asyncio
+import importlib
+import statistics
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from types import MappingProxyType
+
+from homeassistant.config_entries import ConfigEntry, ConfigEntryState
+from homeassistant.const import (
+    ATTR_HW_VERSION,
+    ATTR_SW_VERSION,
+    CONF_HOST,
+    CONF_MAC,
+    CONF_PASSWORD,
+    CONF_PORT,
+    CONF_SCAN_INTERVAL,
+    CONF_USERNAME,
+)
+from homeassistant.core import HomeAssistant
+
+INTEGRATION_DIR = Path(__file__).resolve().parents[1]
+LAG_INTERVAL = 0.005
+
+
+def start_replay_server(capture_module, capture: dict, speed: float) -> int:
+    """Start replay server in its own thread and return its port."""
+    started = threading.Event()
+    server = capture_module.TinycontrolReplayServer(capture, speed)
+
+    async def async_serve() -> None:
+        await server.async_start()
+        started.set()
+        await asyncio.Event().wait()
+
+    threading.Thread(target=asyncio.run, args=(async_serve(),), daemon=True).start()
+    started.wait()
+    return server.port
+
+
+def create_entry(
+    domain: str, capture: dict, index: int, port: int, options: dict
+) -> ConfigEntry:
+    """Create config entry of replayed device."""
+    mac = f"02:00:00:00:{index // 256:02x}:{index % 256:02x}"
+    return ConfigEntry(
+        domain=domain,
+        title=f"Replay {index}",
+        data={
+            CONF_HOST: "127.0.0.1",
+            CONF_PORT: port,
+            CONF_USERNAME: "",
+            CONF_PASSWORD: "",
+            CONF_MAC: mac,
+            ATTR_HW_VERSION: capture["hardware_version"],
+            ATTR_SW_VERSION: capture["software_version"],
+            CONF_SCAN_INTERVAL: 30,
+        },
+        options=options,
+        source="user",
+        version=1,
+        minor_version=1,
+        unique_id=mac,
+        discovery_keys=MappingProxyType({}),
+        subentries_data=None,
+    )
+
+
+async def async_measure_lag(lags: list[float], stop: asyncio.Event) -> None:
+    """Collect delays of short sleeps until stopped."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(LAG_INTERVAL)
+        lags.append(time.perf_counter() - start - LAG_INTERVAL)
+
+
+async def async_run_mode(
+    hass: HomeAssistant,
+    coordinator_module,
+    capture: dict,
+    port: int,
+    devices: int,
+    rounds: int,
+    worker: bool,
+) -> None:
+    """Refresh coordinators in given mode and print loop lag."""
+    coordinators = []
+    for index in range(devices):
+        entry = create_entry(
+            coordinator_module.DOMAIN,
+            capture,
+            index,
+            port,
+            {coordinator_module.CONF_WORKER: worker},
+        )
+        # Entry state is set by config entries manager in real setup.
+        entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+        coordinator = coordinator_module.TinycontrolCoordinator(hass, entry)
+        await coordinator.async_config_entry_first_refresh()
+        coordinators.append(coordinator)
+    lags: list[float] = []
+    stop = asyncio.Event()
+    lag_task = asyncio.create_task(async_measure_lag(lags, stop))
+    start = time.perf_counter()
+    for _ in range(rounds):
+        await asyncio.gather(
+            *(coordinator.async_refresh() for coordinator in coordinators)
+        )
+    elapsed = time.perf_counter() - start
+    stop.set()
+    await lag_task
+    failed = sum(not coordinator.last_update_success for coordinator in coordinators)
+    for coordinator in coordinators:
+        await coordinator.async_shutdown()
+    print(
+        f"{'worker' if worker else 'main loop'}: {devices * rounds} updates "
+        f"in {elapsed:.2f} s ({failed} devices failed)"
+    )
+    if len(lags) > 1:
+        print(
+            f"  loop lag mean {statistics.fmean(lags) * 1000:.1f} ms, "
+            f"p99 {statistics.quantiles(lags, n=100)[-1] * 1000:.1f} ms, "
+            f"max {max(lags) * 1000:.1f} ms"
+        )
+
+
+async def async_main(path: Path, devices: int, rounds: int, speed: float) -> None:
+    """Run benchmark in both modes."""
+    sys.path.insert(0, str(INTEGRATION_DIR.parent))
+    capture_module = importlib.import_module(f"{INTEGRATION_DIR.name}.capture")
+    coordinator_module = importlib.import_module(f"{INTEGRATION_DIR.name}.coordinator")
+    capture = capture_module.load_capture(path)
+    port = start_replay_server(capture_module, capture, speed)
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        for worker in (False, True):
+            await async_run_mode(
+                hass, coordinator_module, capture, port, devices, rounds, worker
+            )
+        await hass.async_stop(force=True)
+
+
+def main() -> None:
+    """Parse arguments and run benchmark."""
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("capture", type=Path)
+    parser.add_argument("--devices", type=int, default=200)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument(
+        "--speed",
+        type=float,
+        default=0.0,
+        help="multiplier of recorded response time (0 - as fast as possible)",
+    )
+    args = parser.parse_args()
+    asyncio.run(async_main(args.capture, args.devices, args.rounds, args.speed))
+
+
+if __name__ == "__main__":
+    main()
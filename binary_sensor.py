@@ -12,14 +12,15 @@ from homeassistant.const import EntityCategory
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
-from .const import DOMAIN
+from .const import DOMAIN, POLL_GROUP_FAST, POLL_GROUP_NORMAL
 from .coordinator import TinycontrolData, TinycontrolCoordinator
-from .entity import TinycontrolEntity
+from .entity import TinycontrolEntity, async_add_dynamic_entities
 
 
 @dataclass(frozen=True, kw_only=True)
 class TinycontrolBinarySensorEntityDescription(BinarySensorEntityDescription):
     entity_registry_enabled_default: bool = False
+    poll_group: str = POLL_GROUP_NORMAL
     has_fn: Callable[[TinycontrolData], bool] = lambda _: True
     is_on_fn: Callable[[TinycontrolData], bool | None]
 
@@ -29,6 +30,7 @@ BINARY_SENSORS = [
         TinycontrolBinarySensorEntityDescription(
             key=f"id{i}",
             name=f"iD{i}",
+            poll_group=POLL_GROUP_FAST,
             # device_class can be set by the user depending on their use case
             entity_category=EntityCategory.DIAGNOSTIC,
             has_fn=lambda x, _i=i: f"iDValue{_i}" in x.state,
@@ -47,13 +49,8 @@ async def async_setup_entry(
     """Set up tinycontrol device binary sensor based on a config entry."""
     coordinator: TinycontrolCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        TinycontrolBinarySensorEntity(
-            coordinator=coordinator,
-            description=description,
-        )
-        for description in BINARY_SENSORS
-        if description.has_fn(coordinator.data)
+    async_add_dynamic_entities(
+        coordinator, async_add_entities, BINARY_SENSORS, TinycontrolBinarySensorEntity
     )
 
 
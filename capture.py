@@ -0,0 +1,166 @@
+"""Recording and replaying HTTP exchanges with tinycontrol devices.
+
+Recorder is attached (as aiohttp trace) to session of device client and keeps
+raw responses with their timing. Captures are saved as JSON files (one per
+device, model and software version) and can be served by replay server, so
+coordinator can be run against realistic data without real device, at
+recorded speed or as fast as possible (see benchmarks/replay.py).
+"""
+
+import asyncio
+import json
+import time
+from collections import defaultdict
+from itertools import cycle
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+from aiohttp import ClientSession, TraceConfig, TraceRequestEndParams, web
+
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN, LOGGER
+
+CAPTURE_DIRECTORY = f"{DOMAIN}_captures"
+# Recording stops after this number of exchanges (capture is saved then).
+CAPTURE_MAX_EXCHANGES = 500
+# Bodies are stored as text decoded with latin-1, which round-trips any bytes.
+BODY_ENCODING = "latin-1"
+
+
+class TinycontrolRecorder:
+    """Record HTTP exchanges of a single device."""
+
+    def __init__(self, hass: HomeAssistant, name: str) -> None:
+        self._hass = hass
+        self._path = self._get_path(name)
+        self.metadata: dict[str, Any] = {}
+        self.exchanges: list[dict[str, Any]] = []
+        self._saved = False
+        self.trace_config = TraceConfig()
+        self.trace_config.on_request_start.append(self._on_request_start)
+        self.trace_config.on_request_end.append(self._on_request_end)
+
+    def _get_path(self, name: str) -> Path:
+        return Path(self._hass.config.path(CAPTURE_DIRECTORY, f"{name}.json"))
+
+    @callback
+    def async_start_capture(self, name: str, metadata: dict[str, Any]) -> None:
+        """Save exchanges recorded so far and start new capture.
+
+        Used when software of device changes, so each capture has responses of
+        a single version.
+        """
+        if self.exchanges and not self._saved:
+            self._hass.async_create_task(
+                self._hass.async_add_executor_job(
+                    save_capture,
+                    self._path,
+                    {**self.metadata, "exchanges": self.exchanges},
+                )
+            )
+        self._path = self._get_path(name)
+        self.metadata = metadata
+        self.exchanges = []
+        self._saved = False
+
+    async def _on_request_start(
+        self, _session: ClientSession, context: SimpleNamespace, _params: Any
+    ) -> None:
+        context.start = time.monotonic()
+
+    async def _on_request_end(
+        self,
+        _session: ClientSession,
+        context: SimpleNamespace,
+        params: TraceRequestEndParams,
+    ) -> None:
+        if len(self.exchanges) >= CAPTURE_MAX_EXCHANGES:
+            return
+        # Body is cached by response, so client reads it again without I/O.
+        body = await params.response.read()
+        self.exchanges.append(
+            {
+                "method": params.method,
+                "path": params.url.path_qs,
+                "status": params.response.status,
+                "content_type": params.response.headers.get("Content-Type"),
+                "body": body.decode(BODY_ENCODING),
+                "elapsed": time.monotonic() - context.start,
+            }
+        )
+        if len(self.exchanges) == CAPTURE_MAX_EXCHANGES:
+            LOGGER.info("Capture is complete, saving it to %s", self._path)
+            self._hass.async_create_task(self.async_save())
+
+    async def async_save(self) -> None:
+        """Save recorded exchanges (once capture is complete or on unload)."""
+        if self._saved or not self.exchanges:
+            return
+        self._saved = len(self.exchanges) >= CAPTURE_MAX_EXCHANGES
+        capture = {**self.metadata, "exchanges": self.exchanges}
+        await self._hass.async_add_executor_job(save_capture, self._path, capture)
+
+
+def save_capture(path: Path, capture: dict[str, Any]) -> None:
+    """Write capture to file."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(capture, indent=1), encoding="utf-8")
+
+
+def load_capture(path: Path) -> dict[str, Any]:
+    """Read capture from file."""
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+class TinycontrolReplayServer:
+    """Local HTTP server answering with recorded responses.
+
+    Responses for the same path are served in recorded order (repeated in
+    cycle). With speed 1 they are delayed by recorded time, with speed 0 they
+    are served right away.
+    """
+
+    def __init__(self, capture: dict[str, Any], speed: float = 1.0) -> None:
+        exchanges = defaultdict(list)
+        for exchange in capture["exchanges"]:
+            exchanges[(exchange["method"], exchange["path"])].append(exchange)
+        self._exchanges = {key: cycle(items) for key, items in exchanges.items()}
+        self._speed = speed
+        self._runner: web.AppRunner | None = None
+        self.port: int | None = None
+
+    async def _handle(self, request: web.Request) -> web.Response:
+        exchanges = self._exchanges.get((request.method, request.path_qs))
+        if exchanges is None:
+            return web.Response(status=404)
+        exchange = next(exchanges)
+        if self._speed:
+            await asyncio.sleep(exchange["elapsed"] * self._speed)
+        return web.Response(
+            status=exchange["status"],
+            body=exchange["body"].encode(BODY_ENCODING),
+            headers=(
+                {"Content-Type": exchange["content_type"]}
+                if exchange["content_type"]
+                else None
+            ),
+        )
+
+    async def async_start(self) -> int:
+        """Start server on free local port and return the port."""
+        app = web.Application()
+        app.router.add_route("*", "/{path:.*}", self._handle)
+        self._runner = web.AppRunner(app)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = site._server.sockets[0].getsockname()[1]
+        return self.port
+
+    async def async_stop(self) -> None:
+        """Stop server."""
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
@@ -7,8 +7,10 @@ from homeassistant.config_entries import (
     SOURCE_REAUTH,
     SOURCE_RECONFIGURE,
     SOURCE_USER,
+    ConfigEntry,
     ConfigFlow,
     FlowCancelledError,
+    OptionsFlow,
 )
 from homeassistant.const import (
     ATTR_HW_VERSION,
@@ -16,6 +18,7 @@ from homeassistant.const import (
     CONF_HOST,
     CONF_MAC,
     CONF_MODEL,
+    CONF_NAME,
     CONF_PASSWORD,
     CONF_PORT,
     CONF_SCAN_INTERVAL,
@@ -23,35 +26,156 @@ from homeassistant.const import (
 )
 from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
+from homeassistant.helpers import selector
 from homeassistant.helpers.aiohttp_client import async_get_clientsession
 from homeassistant.helpers.device_registry import format_mac
 from tinytoolslib.exceptions import TinyToolsError, TinyToolsRequestUnauthenticated
 from tinytoolslib.models import async_get_version
 
-from .const import DEFAULT_SCAN_INTERVAL, DOMAIN
+from .const import (
+    AGGREGATE_FUNCTIONS,
+    AGGREGATE_SUM,
+    CONF_AREA,
+    CONF_COMPACT,
+    CONF_DEADBANDS,
+    CONF_ENTRY_TYPE,
+    CONF_EXPORT,
+    CONF_EXPORT_RETENTION,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_HEDGE_READS,
+    CONF_INPUT_DEBOUNCE,
+    CONF_INPUT_INTERVAL,
+    CONF_LATENCY_BUDGET,
+    CONF_FLOOR,
+    CONF_FUNCTION,
+    CONF_KEYS,
+    CONF_MAX_SILENCE,
+    CONF_POLL_GROUPS,
+    CONF_PROMOTED,
+    CONF_RECORD,
+    CONF_RULES,
+    CONF_TRANSFORMS,
+    CONF_WORKER,
+    CONF_SAMPLING_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_STALE_POLLS,
+    CONF_STALE_TIMEOUT,
+    DEFAULT_SCAN_INTERVAL,
+    DEFAULT_EXPORT_RETENTION,
+    DEFAULT_MAX_SILENCE,
+    DOMAIN,
+    ENTRY_TYPE_AGGREGATE,
+    ENTRY_TYPE_DEVICE,
+    POLL_GROUPS,
+)
+from .coordinator import async_store_probe_data
+from .rules import parse_rule
+from .sensor import parse_deadband
+from .transforms import parse_transform
 
 
 class TinycontrolFlowHandler(ConfigFlow, domain=DOMAIN):
     """Handle config flows for a tinycontrol device."""
 
     VERSION = 1
+    # Data read from device, stored for coordinator only when entry is set up.
+    _probe_data: dict[str, Any] | None = None
+
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry: ConfigEntry) -> OptionsFlow:
+        """Get the options flow for this handler."""
+        return TinycontrolOptionsFlowHandler()
+
+    @classmethod
+    @callback
+    def async_supports_options_flow(cls, config_entry: ConfigEntry) -> bool:
+        """Return options flow support for this handler (only devices have options)."""
+        return (
+            config_entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE)
+            == ENTRY_TYPE_DEVICE
+        )
 
     async def async_step_user(
         self,
         user_input: dict[str, Any] | None = None,
     ) -> FlowResult:
         """Handle a flow initiated by the user."""
+        return self.async_show_menu(
+            step_id="user", menu_options=[ENTRY_TYPE_DEVICE, ENTRY_TYPE_AGGREGATE]
+        )
+
+    async def async_step_device(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle adding a device."""
         if user_input is None:
             return self._async_show_setup_form()
         entry_data = {**user_input}
         return await self._async_step(entry_data)
 
+    async def async_step_aggregate(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle adding an aggregate sensor of many devices."""
+        if user_input is not None:
+            return self.async_create_entry(
+                title=user_input[CONF_NAME],
+                data={CONF_ENTRY_TYPE: ENTRY_TYPE_AGGREGATE, **user_input},
+            )
+        return self.async_show_form(
+            step_id="aggregate", data_schema=self._get_aggregate_schema({})
+        )
+
+    async def async_step_reconfigure_aggregate(
+        self,
+        user_input: dict[str, Any] | None = None,
+    ) -> FlowResult:
+        """Handle reconfiguring an aggregate sensor."""
+        entry = self._get_reconfigure_entry()
+        if user_input is not None:
+            # Whole data is replaced, so cleared area/floor are removed.
+            return self.async_update_reload_and_abort(
+                entry,
+                title=user_input[CONF_NAME],
+                data={CONF_ENTRY_TYPE: ENTRY_TYPE_AGGREGATE, **user_input},
+            )
+        return self.async_show_form(
+            step_id="reconfigure_aggregate",
+            data_schema=self._get_aggregate_schema(entry.data),
+        )
+
+    @staticmethod
+    def _get_aggregate_schema(entry_data: dict[str, Any]) -> vol.Schema:
+        """Return schema of aggregate sensor (with values of existing one)."""
+        return vol.Schema(
+            {
+                vol.Required(CONF_NAME, default=entry_data.get(CONF_NAME, "")): str,
+                vol.Required(CONF_KEYS, default=entry_data.get(CONF_KEYS, "")): str,
+                vol.Required(
+                    CONF_FUNCTION, default=entry_data.get(CONF_FUNCTION, AGGREGATE_SUM)
+                ): vol.In(AGGREGATE_FUNCTIONS),
+                vol.Optional(
+                    CONF_AREA,
+                    description={"suggested_value": entry_data.get(CONF_AREA)},
+                ): selector.AreaSelector(),
+                vol.Optional(
+                    CONF_FLOOR,
+                    description={"suggested_value": entry_data.get(CONF_FLOOR)},
+                ): selector.FloorSelector(),
+            }
+        )
+
     async def async_step_reconfigure(
         self,
         user_input: dict[str, Any] | None = None,
     ) -> FlowResult:
         """Handle a reconfigure flow."""
         entry = self._get_reconfigure_entry()
+        if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE) == ENTRY_TYPE_AGGREGATE:
+            return await self.async_step_reconfigure_aggregate()
         if user_input is None:
             return self._async_show_setup_form(entry.data)
         entry_data = {**entry.data, **user_input}
@@ -124,7 +248,7 @@ class TinycontrolFlowHandler(ConfigFlow, domain=DOMAIN):
         else:
             raise FlowCancelledError(f"No data schema for current flow {self.source}")
         return self.async_show_form(
-            step_id=self.source,
+            step_id=ENTRY_TYPE_DEVICE if self.source == SOURCE_USER else self.source,
             data_schema=data_schema,
             errors=errors or {},
         )
@@ -138,15 +262,28 @@ class TinycontrolFlowHandler(ConfigFlow, domain=DOMAIN):
                 entry = self._get_reauth_entry()
             else:  # self.source == SOURCE_RECONFIGURE:
                 entry = self._get_reconfigure_entry()
+            self._async_store_probe_data()
             return self.async_update_reload_and_abort(entry, data_updates=entry_data)
         self._abort_if_unique_id_configured()
+        self._async_store_probe_data()
         return self.async_create_entry(
             title=f"{entry_data[CONF_MODEL]} ({entry_data[CONF_MAC]}, {entry_data[CONF_HOST]}:{entry_data[CONF_PORT]})",
             data=entry_data,
         )
 
-    async def _get_device_info(self, entry_data: dict[str, Any]) -> None:
-        """Get device information from a Tinycontrol device."""
+    @callback
+    def _async_store_probe_data(self) -> None:
+        """Store data read from device for the coordinator of entry."""
+        if self._probe_data is not None:
+            async_store_probe_data(self.hass, self._probe_data["mac"], self._probe_data)
+
+    async def _get_device_info(self, entry_data: dict[str, Any]) -> dict[str, Any]:
+        """Get device information from a Tinycontrol device.
+
+        Device is queried only for version (to select model) and then for all data,
+        which contains MAC. The data is kept for the coordinator (when entry is
+        set up), so its first refresh doesn't have to read the device again.
+        """
         session = async_get_clientsession(self.hass)
         version_info = await async_get_version(
             entry_data[CONF_HOST],
@@ -160,6 +297,7 @@ class TinycontrolFlowHandler(ConfigFlow, domain=DOMAIN):
         )
         tiny_device = version_info["device_model"]
         data = await tiny_device.async_get_all()
+        self._probe_data = data
         # Return device data
         return {
             CONF_MODEL: tiny_device.info.model,
@@ -172,3 +310,125 @@ class TinycontrolFlowHandler(ConfigFlow, domain=DOMAIN):
             ATTR_SW_VERSION: version_info["software_version"],
             CONF_SCAN_INTERVAL: entry_data[CONF_SCAN_INTERVAL],
         }
+
+
+class TinycontrolOptionsFlowHandler(OptionsFlow):
+    """Handle options for a tinycontrol device."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        errors = {}
+        if user_input is not None:
+            poll_groups = user_input.get(CONF_POLL_GROUPS, {})
+            if not isinstance(poll_groups, dict) or any(
+                group not in POLL_GROUPS for group in poll_groups.values()
+            ):
+                errors[CONF_POLL_GROUPS] = "invalid_poll_groups"
+            deadbands = user_input.get(CONF_DEADBANDS, {})
+            try:
+                for value in deadbands.values():
+                    parse_deadband(value)
+            except (AttributeError, TypeError, ValueError):
+                errors[CONF_DEADBANDS] = "invalid_deadbands"
+            try:
+                for rule in user_input.get(CONF_RULES, []):
+                    parse_rule(rule)
+            except (KeyError, TypeError, ValueError):
+                errors[CONF_RULES] = "invalid_rules"
+            try:
+                for key, transform in user_input.get(CONF_TRANSFORMS, {}).items():
+                    parse_transform(key, transform)
+            except (AttributeError, TypeError, ValueError):
+                errors[CONF_TRANSFORMS] = "invalid_transforms"
+            promoted = user_input.get(CONF_PROMOTED, [])
+            if not isinstance(promoted, list) or not all(
+                isinstance(key, str) for key in promoted
+            ):
+                errors[CONF_PROMOTED] = "invalid_promoted"
+            if user_input.get(CONF_RECORD) and user_input.get(CONF_WORKER):
+                # Worker reads device with its own session, which isn't traced.
+                errors[CONF_WORKER] = "record_with_worker"
+            if not errors:
+                return self.async_create_entry(data=user_input)
+        options = user_input or self.config_entry.options
+        data_schema = vol.Schema(
+            {
+                vol.Optional(
+                    CONF_STALE_POLLS, default=options.get(CONF_STALE_POLLS, 0)
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_STALE_TIMEOUT, default=options.get(CONF_STALE_TIMEOUT, 0)
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_FAST_SCAN_INTERVAL,
+                    default=options.get(CONF_FAST_SCAN_INTERVAL, 0),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SLOW_SCAN_INTERVAL,
+                    default=options.get(CONF_SLOW_SCAN_INTERVAL, 0),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_POLL_GROUPS, default=options.get(CONF_POLL_GROUPS, {})
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_DEADBANDS, default=options.get(CONF_DEADBANDS, {})
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_MAX_SILENCE,
+                    default=options.get(
+                        CONF_MAX_SILENCE, int(DEFAULT_MAX_SILENCE.total_seconds())
+                    ),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_SAMPLING_INTERVAL,
+                    default=options.get(CONF_SAMPLING_INTERVAL, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_INPUT_INTERVAL,
+                    default=options.get(CONF_INPUT_INTERVAL, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_INPUT_DEBOUNCE,
+                    default=options.get(CONF_INPUT_DEBOUNCE, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_LATENCY_BUDGET,
+                    default=options.get(CONF_LATENCY_BUDGET, 0),
+                ): vol.All(vol.Coerce(float), vol.Range(min=0)),
+                vol.Optional(
+                    CONF_HEDGE_READS, default=options.get(CONF_HEDGE_READS, False)
+                ): bool,
+                vol.Optional(
+                    CONF_RULES, default=options.get(CONF_RULES, [])
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_TRANSFORMS, default=options.get(CONF_TRANSFORMS, {})
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_COMPACT, default=options.get(CONF_COMPACT, False)
+                ): bool,
+                vol.Optional(
+                    CONF_PROMOTED, default=options.get(CONF_PROMOTED, [])
+                ): selector.ObjectSelector(),
+                vol.Optional(
+                    CONF_EXPORT, default=options.get(CONF_EXPORT, False)
+                ): bool,
+                vol.Optional(
+                    CONF_EXPORT_RETENTION,
+                    default=options.get(
+                        CONF_EXPORT_RETENTION, DEFAULT_EXPORT_RETENTION
+                    ),
+                ): vol.All(int, vol.Range(min=0)),
+                vol.Optional(
+                    CONF_RECORD, default=options.get(CONF_RECORD, False)
+                ): bool,
+                vol.Optional(
+                    CONF_WORKER, default=options.get(CONF_WORKER, False)
+                ): bool,
+            }
+        )
+        return self.async_show_form(
+            step_id="init", data_schema=data_schema, errors=errors
+        )
@@ -8,3 +8,92 @@ DOMAIN = "tinycontrol"
 
 LOGGER = logging.getLogger(__package__)
 DEFAULT_SCAN_INTERVAL = timedelta(seconds=30)
+
+# Circuit breaker - after few failed updates only check if device accepts connections.
+CIRCUIT_BREAKER_THRESHOLD = 3
+CIRCUIT_BREAKER_MAX_INTERVAL = timedelta(minutes=10)
+CIRCUIT_BREAKER_PROBE_TIMEOUT = 3
+
+# Fast-fail setup - device that doesn't respond quickly is set up again later,
+# retries start with random delay, so devices that failed together (eg. at
+# startup) are not retried at the same time.
+FIRST_REFRESH_TIMEOUT = 10
+SETUP_RETRY_JITTER = 5
+SETUP_RETRIES_KEY = f"{DOMAIN}_setup_retries"
+
+# Reads of device - hedging of slow reads and time limit of whole update.
+CONF_HEDGE_READS = "hedge_reads"
+CONF_LATENCY_BUDGET = "latency_budget"
+
+# Minimal interval between writes of value set continuously (eg. PWM duty slider).
+WRITE_INTERVAL = 0.5
+
+# Grace mode - keep last good data (marked as stale) for few failed updates.
+CONF_STALE_POLLS = "stale_polls"
+CONF_STALE_TIMEOUT = "stale_timeout"
+ATTR_STALE_SINCE = "stale_since"
+
+# Poll groups - entities can be updated more or less often than the rest of device.
+POLL_GROUP_FAST = "fast"
+POLL_GROUP_NORMAL = "normal"
+POLL_GROUP_SLOW = "slow"
+POLL_GROUPS = [POLL_GROUP_FAST, POLL_GROUP_NORMAL, POLL_GROUP_SLOW]
+CONF_FAST_SCAN_INTERVAL = "fast_scan_interval"
+CONF_SLOW_SCAN_INTERVAL = "slow_scan_interval"
+CONF_POLL_GROUPS = "poll_groups"
+
+# High-rate sampling of tcPDU readings, published as aggregates with regular updates.
+CONF_SAMPLING_INTERVAL = "sampling_interval"
+
+# Fast watching of digital inputs, changes are fired as events.
+CONF_INPUT_INTERVAL = "input_interval"
+CONF_INPUT_DEBOUNCE = "input_debounce"
+EVENT_INPUT_CHANGED = f"{DOMAIN}_input_changed"
+ATTR_INPUT = "input"
+
+# Deadband - sensor state is written only when its value changes significantly.
+CONF_DEADBANDS = "deadbands"
+CONF_MAX_SILENCE = "max_silence"
+DEFAULT_MAX_SILENCE = timedelta(minutes=15)
+
+# Export of raw readings to local files (line protocol).
+CONF_EXPORT = "export"
+CONF_EXPORT_RETENTION = "export_retention"
+DEFAULT_EXPORT_RETENTION = 30
+
+# Recording of HTTP exchanges with device (for replaying them without device).
+CONF_RECORD = "record"
+
+# Reading devices in worker thread (for very large number of devices).
+CONF_WORKER = "worker"
+
+# Threshold rules executed by coordinator right after update.
+CONF_RULES = "rules"
+
+# Transforms (scale, clamp, unit, device class) of custom readings mX and diffX.
+CONF_TRANSFORMS = "transforms"
+
+# Compact mode - channel groups as single entities (channels only when promoted).
+CONF_COMPACT = "compact"
+CONF_PROMOTED = "promoted"
+# Controllable channels (eg. VARs) are not grouped, they keep their entities.
+COMPACT_GROUPS = ["ds", "diff", "iA", "power", "energy", "mValue"]
+
+# Aggregate entries - sensors combining readings of many devices.
+CONF_ENTRY_TYPE = "entry_type"
+ENTRY_TYPE_DEVICE = "device"
+ENTRY_TYPE_AGGREGATE = "aggregate"
+CONF_KEYS = "keys"
+CONF_FUNCTION = "function"
+CONF_AREA = "area"
+CONF_FLOOR = "floor"
+AGGREGATE_SUM = "sum"
+AGGREGATE_MEAN = "mean"
+AGGREGATE_MIN = "min"
+AGGREGATE_MAX = "max"
+AGGREGATE_FUNCTIONS = [AGGREGATE_SUM, AGGREGATE_MEAN, AGGREGATE_MIN, AGGREGATE_MAX]
+SIGNAL_COORDINATORS_CHANGED = f"{DOMAIN}_coordinators_changed"
+
+# Data read while probing device in config flow, reused by first coordinator refresh.
+PROBE_DATA_KEY = f"{DOMAIN}_probe_data"
+PROBE_DATA_MAX_AGE = timedelta(seconds=60)
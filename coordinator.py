@@ -1,7 +1,17 @@
-from dataclasses import dataclass
-from datetime import timedelta
+import asyncio
+import math
+import random
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass, field, replace
+from datetime import datetime, timedelta
+from functools import cached_property, partial
+from typing import Any
+
+from aiohttp import ClientSession
 
 from homeassistant.config_entries import ConfigEntry, ConfigEntryAuthFailed
+from homeassistant.exceptions import ConfigEntryNotReady
 from homeassistant.const import (
     CONF_HOST,
     CONF_PORT,
@@ -11,16 +21,117 @@ from homeassistant.const import (
     ATTR_HW_VERSION,
     ATTR_SW_VERSION,
     CONF_MAC,
+    ATTR_CONNECTIONS,
+    ATTR_STATE,
+)
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import (
+    async_create_clientsession,
+    async_get_clientsession,
 )
-from homeassistant.core import HomeAssistant
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
-from homeassistant.helpers.device_registry import format_mac
+from homeassistant.helpers.device_registry import (
+    CONNECTION_NETWORK_MAC,
+    DeviceInfo,
+    format_mac,
+)
+from homeassistant.helpers.event import async_track_time_interval
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from tinytoolslib.exceptions import TinyToolsError, TinyToolsRequestUnauthenticated
-from tinytoolslib.models import get_device
+from tinytoolslib.exceptions import (
+    TinyToolsError,
+    TinyToolsRequestConnectionError,
+    TinyToolsRequestUnauthenticated,
+)
+from tinytoolslib.models import DeviceModel, get_device
+
+from .const import (
+    ATTR_INPUT,
+    CIRCUIT_BREAKER_MAX_INTERVAL,
+    CIRCUIT_BREAKER_PROBE_TIMEOUT,
+    CIRCUIT_BREAKER_THRESHOLD,
+    CONF_EXPORT,
+    CONF_EXPORT_RETENTION,
+    CONF_FAST_SCAN_INTERVAL,
+    CONF_HEDGE_READS,
+    CONF_INPUT_DEBOUNCE,
+    CONF_INPUT_INTERVAL,
+    CONF_LATENCY_BUDGET,
+    CONF_POLL_GROUPS,
+    CONF_RECORD,
+    CONF_RULES,
+    CONF_SAMPLING_INTERVAL,
+    CONF_SLOW_SCAN_INTERVAL,
+    CONF_STALE_POLLS,
+    CONF_STALE_TIMEOUT,
+    CONF_TRANSFORMS,
+    CONF_WORKER,
+    DEFAULT_EXPORT_RETENTION,
+    DOMAIN,
+    EVENT_INPUT_CHANGED,
+    FIRST_REFRESH_TIMEOUT,
+    LOGGER,
+    POLL_GROUP_FAST,
+    POLL_GROUP_NORMAL,
+    POLL_GROUP_SLOW,
+    POLL_GROUPS,
+    PROBE_DATA_KEY,
+    PROBE_DATA_MAX_AGE,
+    SETUP_RETRIES_KEY,
+    SETUP_RETRY_JITTER,
+    WRITE_INTERVAL,
+)
+from .capture import TinycontrolRecorder
+from .energy import TinycontrolEnergyIntegrator
+from .export import TinycontrolExporter
+from .inputs import INPUT_KEY_PREFIX, INPUTS_SECTION, TinycontrolInputWatcher
+from .latency import TinycontrolReader
+from .request_queue import TinycontrolRequestQueue, TinycontrolWriteCoalescer
+from .rules import ThresholdRule, TinycontrolRuleEngine
+from .sampling import TinycontrolSampler
+from .transforms import TinycontrolTransforms
+from .worker import (
+    TinycontrolWorker,
+    TinycontrolWorkerDevice,
+    async_acquire_worker,
+    async_release_worker,
+)
 
-from .const import DOMAIN, LOGGER
+# Status API of LK4/tcPDU allows reading only selected sections, so poll groups
+# can fetch just what their entities need. Sections are matched by entity key.
+STATUS_API_PATH = "/api/v1/read/status/"
+STATUS_API_SECTIONS = {
+    "boardValues": ("boardTemp", "boardHum", "boardVoltage"),
+    "dsValues": ("ds",),
+    "i2cValues": ("i2c",),
+    "otherSensorsValues": ("pm", "co2"),
+    "diffValues": ("diff",),
+    "iAValues": ("iA",),
+    "iDValues": ("id",),
+    "powerValues": (
+        "power",
+        "energy",
+        "uRms",
+        "iRms",
+        "pActive",
+        "pReactive",
+        "pApparent",
+        "pFactor",
+    ),
+    "mrValues": ("mValue",),
+    "outValues": ("out",),
+    "pwmValues": ("pwm",),
+    "varValues": ("var", "event"),
+}
+
+
+def get_status_section(key: str) -> str | None:
+    """Return section of status API containing value for entity key."""
+    for section, prefixes in STATUS_API_SECTIONS.items():
+        if key.startswith(prefixes):
+            return section
+    return None
 
 
 @dataclass
@@ -32,6 +143,38 @@ class TinycontrolData:
     software_version: str
     mac: str
     state: dict
+    stale_since: datetime | None = None
+    command_latency: float | None = None
+    samples: dict[str, dict[str, float | None]] = field(default_factory=dict)
+    energy: dict[str, float] = field(default_factory=dict)
+
+
+@callback
+def async_get_coordinators(hass: HomeAssistant) -> list["TinycontrolCoordinator"]:
+    """Return coordinators of all set up devices."""
+    return [
+        coordinator
+        for coordinator in hass.data.get(DOMAIN, {}).values()
+        if isinstance(coordinator, TinycontrolCoordinator)
+    ]
+
+
+@callback
+def async_store_probe_data(hass: HomeAssistant, mac: str, data: dict) -> None:
+    """Store data read during config flow, so setup of entry doesn't fetch it again."""
+    hass.data.setdefault(PROBE_DATA_KEY, {})[format_mac(mac)] = (time.monotonic(), data)
+
+
+@callback
+def async_pop_probe_data(hass: HomeAssistant, mac: str) -> dict | None:
+    """Return stored probe data for device if it's still fresh."""
+    stored = hass.data.get(PROBE_DATA_KEY, {}).pop(format_mac(mac), None)
+    if stored is None:
+        return None
+    timestamp, data = stored
+    if time.monotonic() - timestamp > PROBE_DATA_MAX_AGE.total_seconds():
+        return None
+    return data
 
 
 class TinycontrolCoordinator(DataUpdateCoordinator[TinycontrolData]):
@@ -40,6 +183,18 @@ class TinycontrolCoordinator(DataUpdateCoordinator[TinycontrolData]):
 
     def __init__(self, hass: HomeAssistant, entry: ConfigEntry) -> None:
         self.config_entry = entry
+        self._recorder: TinycontrolRecorder | None = None
+        # Own session of recorder, closed on shutdown (also after failed setup).
+        self._recorder_session: ClientSession | None = None
+        if entry.options.get(CONF_RECORD, False):
+            self._recorder = TinycontrolRecorder(
+                hass, self._get_capture_name(entry.data[ATTR_SW_VERSION])
+            )
+            session = self._recorder_session = async_create_clientsession(
+                hass, trace_configs=[self._recorder.trace_config]
+            )
+        else:
+            session = async_get_clientsession(hass)
         self.client = get_device(
             entry.data[ATTR_HW_VERSION],
             entry.data[ATTR_SW_VERSION],
@@ -48,23 +203,228 @@ class TinycontrolCoordinator(DataUpdateCoordinator[TinycontrolData]):
             port=entry.data[CONF_PORT],
             username=entry.data[CONF_USERNAME],
             password=entry.data[CONF_PASSWORD],
-            session=async_get_clientsession(hass),
+            session=session,
         )
         if self.client is None:
             LOGGER.error(
                 "TinycontrolCoordinator failed to create device client (%s)",
                 entry.data[CONF_MAC],
             )
+        elif self._recorder is not None:
+            self._recorder.metadata = {
+                "model": self.client.info.model,
+                "hardware_version": entry.data[ATTR_HW_VERSION],
+                "software_version": entry.data[ATTR_SW_VERSION],
+            }
+        self._probe_data = async_pop_probe_data(hass, entry.data[CONF_MAC])
+        self._stale_polls = entry.options.get(CONF_STALE_POLLS, 0)
+        self._stale_timeout = entry.options.get(CONF_STALE_TIMEOUT, 0)
+        self._failed_polls = 0
+        self._scan_interval = timedelta(seconds=entry.data[CONF_SCAN_INTERVAL])
+        self._circuit_open = False
+        self._poll_group_intervals = {
+            POLL_GROUP_FAST: entry.options.get(CONF_FAST_SCAN_INTERVAL, 0),
+            POLL_GROUP_SLOW: entry.options.get(CONF_SLOW_SCAN_INTERVAL, 0),
+        }
+        self._poll_group_overrides = entry.options.get(CONF_POLL_GROUPS, {})
+        self._poll_keys: dict[str, str] = {}
+        self._unsub_poll_groups: dict[str, CALLBACK_TYPE] = {}
+        # Poll groups with update in progress (their ticks are skipped).
+        self._pending_poll_groups: set[str] = set()
+        self.request_queue = TinycontrolRequestQueue()
+        self.write_coalescer = TinycontrolWriteCoalescer(WRITE_INTERVAL)
+        self._reader = TinycontrolReader(entry.options.get(CONF_HEDGE_READS, False))
+        self._latency_budget = entry.options.get(CONF_LATENCY_BUDGET, 0)
+        self._use_worker = entry.options.get(CONF_WORKER, False)
+        self._worker: TinycontrolWorker | None = None
+        self._worker_device: TinycontrolWorkerDevice | None = None
+        self._fetch_task: asyncio.Task[TinycontrolData] | None = None
+        self._followup_fetch_task: asyncio.Task[TinycontrolData] | None = None
+        # Options the coordinator was set up with (only their change needs reload).
+        self.options = dict(entry.options)
+        # Incremented when set of keys in state changes (eg. after firmware upgrade),
+        # so platforms can add/remove entities without reloading entry.
+        self.keys_version = 0
+        # Listeners of changed readings (eg. websocket subscriptions) and state
+        # they were last notified about.
+        self._delta_listeners: list[Callable[[dict], None]] = []
+        self._published_state: dict = {}
+        self.command_latency: float | None = None
+        # Counters of updates (full and poll groups) exposed as metrics.
+        self.poll_count = 0
+        self.poll_errors = 0
+        self.poll_latency: float | None = None
+        self.has_status_api = self.client is not None and any(
+            url.startswith(STATUS_API_PATH) for url in self.client._get_all()
+        )
+        self._energy = TinycontrolEnergyIntegrator(
+            hass, entry.entry_id, self._scan_interval.total_seconds()
+        )
+        self._sampling_interval = entry.options.get(CONF_SAMPLING_INTERVAL, 0)
+        self._sampler: TinycontrolSampler | None = None
+        self._unsub_sampling: CALLBACK_TYPE | None = None
+        # Ticks are skipped while previous sample is pending (slow device).
+        self._sample_pending = False
+        if self._sampling_interval and self.has_status_api:
+            self._sampler = TinycontrolSampler(
+                math.ceil(self._scan_interval.total_seconds() / self._sampling_interval)
+            )
+        self._rules = TinycontrolRuleEngine(entry.options.get(CONF_RULES, []))
+        self.transforms = TinycontrolTransforms(entry.options.get(CONF_TRANSFORMS, {}))
+        self._input_interval = entry.options.get(CONF_INPUT_INTERVAL, 0)
+        self._input_watcher: TinycontrolInputWatcher | None = None
+        self._unsub_inputs: CALLBACK_TYPE | None = None
+        self._inputs_pending = False
+        if self._input_interval and self.has_status_api:
+            self._input_watcher = TinycontrolInputWatcher(
+                entry.options.get(CONF_INPUT_DEBOUNCE, 0)
+            )
+        self._exporter: TinycontrolExporter | None = None
+        if entry.options.get(CONF_EXPORT, False):
+            self._exporter = TinycontrolExporter(
+                hass,
+                entry.data[CONF_MAC],
+                entry.options.get(CONF_EXPORT_RETENTION, DEFAULT_EXPORT_RETENTION),
+            )
         super().__init__(
             hass,
             LOGGER,
             name=f"{DOMAIN}_{entry.data[CONF_MAC]}",
-            update_interval=timedelta(seconds=entry.data[CONF_SCAN_INTERVAL]),
+            update_interval=self._scan_interval,
+            # Skip updating entities when device returns exactly the same data,
+            # it also keeps entities quiet while data is stale.
+            always_update=False,
         )
 
+    def _get_capture_name(self, software_version: str) -> str:
+        """Return name of capture of HTTP exchanges with device."""
+        return "-".join(
+            (
+                format_mac(self.config_entry.data[CONF_MAC]).replace(":", ""),
+                self.config_entry.data[ATTR_HW_VERSION],
+                software_version,
+            )
+        )
+
+    @cached_property
+    def device_info(self) -> DeviceInfo:
+        """Return device info shared by all entities of device (don't modify it)."""
+        device_info = DeviceInfo(
+            identifiers={(DOMAIN, self.data.mac)},
+            manufacturer="tinycontrol",
+            model=self.data.model,
+            sw_version=self.data.software_version,
+            hw_version=self.data.hardware_version,
+        )
+        if (mac := self.config_entry.data.get(CONF_MAC)) is not None:
+            device_info[ATTR_CONNECTIONS] = {(CONNECTION_NETWORK_MAC, format_mac(mac))}
+        return device_info
+
+    async def _async_setup(self) -> None:
+        """Load persisted state (and start worker) before first update."""
+        await self._energy.async_load()
+        if self._use_worker and self._worker is None:
+            self._worker = await async_acquire_worker(self.hass)
+            self._worker_device = TinycontrolWorkerDevice(self._worker, self.client)
+
+    async def async_fast_first_refresh(self) -> None:
+        """Refresh data for the first time, failing fast when device is down.
+
+        Device is checked for accepting connections first (unless data from config
+        flow is available) and the whole refresh is limited by short timeout, so
+        unreachable devices don't hold up startup. Retried setup starts after
+        random delay, as Home Assistant retries devices that failed together
+        (eg. after power outage or at startup) at the same time.
+        """
+        retried = self.hass.data.setdefault(SETUP_RETRIES_KEY, set())
+        entry_id = self.config_entry.entry_id
+        if entry_id in retried:
+            await asyncio.sleep(random.uniform(0, SETUP_RETRY_JITTER))
+        try:
+            await self._async_fast_first_refresh()
+        except ConfigEntryNotReady:
+            retried.add(entry_id)
+            raise
+        retried.discard(entry_id)
+
+    async def _async_fast_first_refresh(self) -> None:
+        """Check connection and refresh data within short timeout."""
+        if self._probe_data is None:
+            try:
+                await self._async_probe_connection()
+            except TinyToolsError as exc:
+                raise ConfigEntryNotReady(
+                    f"Device {self.client.host}:{self.client.port} is not reachable"
+                ) from exc
+        try:
+            async with asyncio.timeout(FIRST_REFRESH_TIMEOUT):
+                await self.async_config_entry_first_refresh()
+        except TimeoutError as exc:
+            if self._fetch_task is not None:
+                # Fetch is shared (shielded), so it has to be cancelled explicitly.
+                self._fetch_task.cancel()
+            raise ConfigEntryNotReady(
+                f"Device {self.client.host}:{self.client.port} didn't respond in time"
+            ) from exc
+
     async def _async_update_data(self) -> TinycontrolData:
+        """Fetch data, sharing a single fetch between concurrent refreshes.
+
+        Refresh requested while fetch is running (eg. after commands) waits for
+        one follow-up fetch shared by all such refreshes, as the running one may
+        have read the device before the change.
+        """
+        if self._fetch_task is None:
+            task = self._fetch_task = asyncio.ensure_future(self._async_fetch(None))
+        else:
+            if self._followup_fetch_task is None:
+                self._followup_fetch_task = asyncio.ensure_future(
+                    self._async_fetch(self._fetch_task)
+                )
+            task = self._followup_fetch_task
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, previous: asyncio.Task | None) -> TinycontrolData:
+        """Fetch data (after previous fetch finishes)."""
+        if previous is not None:
+            await asyncio.wait([previous])
+            self._fetch_task, self._followup_fetch_task = (
+                self._followup_fetch_task,
+                None,
+            )
+        try:
+            return await self._async_fetch_data()
+        finally:
+            if self._fetch_task is asyncio.current_task() and (
+                self._followup_fetch_task is None
+            ):
+                self._fetch_task = None
+
+    async def _async_fetch_data(self) -> TinycontrolData:
+        """Fetch data from device (or reuse data read by config flow)."""
         try:
-            data = await self.client.async_get_all()
+            if self._circuit_open:
+                # Circuit is half-open after successful probe - it's closed only
+                # when full update succeeds, otherwise backoff keeps growing.
+                await self._async_probe_connection()
+            if self._probe_data is not None:
+                # First refresh right after config flow - reuse data it has read.
+                data = fresh = self.transforms.apply(self._probe_data)
+                self._probe_data = None
+            else:
+                data = fresh = await self._async_timed_poll(self._async_get_all)
+                if self.data is not None and self._get_excluded_sections():
+                    # Keep values of excluded sections from their latest update.
+                    data = {**self.data.state, **fresh}
+            if self._circuit_open:
+                self._close_circuit()
+            self._failed_polls = 0
+            if self.data is not None:
+                self._async_check_changes(data)
+            self._async_run_rules(data)
+            if self._exporter is not None:
+                # Only values that were read, not the kept ones.
+                self._exporter.add(fresh)
             return TinycontrolData(
                 model=self.client.info.model,
                 hardware_version=data.get(
@@ -75,10 +435,455 @@ class TinycontrolCoordinator(DataUpdateCoordinator[TinycontrolData]):
                 ),
                 mac=format_mac(data.get("mac")),
                 state=data,
+                command_latency=self.command_latency,
+                samples=self._sampler.aggregate(data) if self._sampler else {},
+                energy=self._energy.update(data),
             )
         except TinyToolsRequestUnauthenticated as exc:
             raise ConfigEntryAuthFailed(
                 f"Credentials expired for {self.client.host}:{self.client.port}"
             ) from exc
         except TinyToolsError as exc:
+            self.poll_errors += 1
+            self._failed_polls += 1
+            if self._failed_polls >= CIRCUIT_BREAKER_THRESHOLD:
+                self._open_circuit()
+            if (stale_data := self._get_stale_data()) is not None:
+                LOGGER.debug(
+                    "Keeping stale data for %s after %s failed update(s): %s",
+                    self.data.mac,
+                    self._failed_polls,
+                    exc,
+                )
+                return stale_data
             raise UpdateFailed(exc) from exc
+
+    async def _async_timed_poll(self, job: Callable[[], Awaitable[dict]]) -> dict:
+        """Poll device through request queue and count it with its latency."""
+        start = time.monotonic()
+        data = await self.request_queue.async_poll(partial(self._async_budgeted, job))
+        self.poll_latency = time.monotonic() - start
+        self.poll_count += 1
+        return data
+
+    async def _async_budgeted(self, job: Callable[[], Awaitable[dict]]) -> dict:
+        """Run poll within latency budget (if set)."""
+        try:
+            async with asyncio.timeout(self._latency_budget or None):
+                return await job()
+        except TimeoutError as exc:
+            raise TinyToolsRequestConnectionError(
+                f"Update exceeded latency budget of {self._latency_budget} s"
+            ) from exc
+
+    async def _async_read(
+        self, key: str, read_fn: Callable[[DeviceModel], Awaitable[dict]]
+    ) -> dict:
+        """Read device (in worker, if enabled) with adaptive timeout (and hedging)."""
+        if self._worker_device is not None:
+            job = partial(self._worker_device.async_read, key, read_fn)
+        else:
+            job = partial(read_fn, self.client)
+        return await self._reader.async_read(key, job)
+
+    async def _async_read_url(self, url: str) -> dict:
+        """Read URL of device."""
+        return await self._async_read(url, lambda client: client.async_get(url))
+
+    def _get_excluded_sections(self) -> set[str]:
+        """Return status API sections that are not read by full update."""
+        excluded = {
+            section
+            for section, poll_group in self._get_section_owners().items()
+            if poll_group != POLL_GROUP_NORMAL
+        }
+        if self._input_watcher is not None:
+            # Inputs are updated only by watcher, which debounces them.
+            excluded.add(INPUTS_SECTION)
+        return excluded
+
+    async def _async_get_all(self) -> dict:
+        """Get all data, except sections that are updated only by other poll groups.
+
+        Values of excluded sections are not included (they're kept by caller).
+        """
+        excluded = self._get_excluded_sections()
+        if not excluded or self.data is None:
+            return self.transforms.apply(
+                await self._async_read("all", lambda client: client.async_get_all())
+            )
+        data = {}
+        for url in self.client._get_all():
+            if url.startswith(STATUS_API_PATH):
+                sections = url.split("?", 1)[1].split("&")
+                url = (
+                    STATUS_API_PATH
+                    + "?"
+                    + "&".join(
+                        section for section in sections if section not in excluded
+                    )
+                )
+            data.update(await self._async_read_url(url))
+        return self.transforms.apply(data)
+
+    @callback
+    def async_add_delta_listener(
+        self, delta_callback: Callable[[dict], None]
+    ) -> CALLBACK_TYPE:
+        """Listen for readings that have changed with update of data."""
+        if not self._delta_listeners:
+            self._published_state = self.data.state if self.data is not None else {}
+        self._delta_listeners.append(delta_callback)
+        return partial(self._delta_listeners.remove, delta_callback)
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Update all listeners, passing changed readings to delta listeners."""
+        if (
+            self._delta_listeners
+            and self.data is not None
+            and self.data.state is not self._published_state
+        ):
+            previous, self._published_state = self._published_state, self.data.state
+            if delta := {
+                key: value
+                for key, value in self._published_state.items()
+                if key not in previous or previous[key] != value
+            }:
+                for delta_callback in list(self._delta_listeners):
+                    delta_callback(delta)
+        super().async_update_listeners()
+
+    @callback
+    def async_register_poll_key(self, key: str, poll_group: str) -> CALLBACK_TYPE:
+        """Register entity key to be updated within given (or overridden) poll group."""
+        poll_group = self._poll_group_overrides.get(key, poll_group)
+        if (
+            not self._poll_group_intervals.get(poll_group)
+            or get_status_section(key) is None
+            or not any(
+                url.startswith(STATUS_API_PATH) for url in self.client._get_all()
+            )
+        ):
+            poll_group = POLL_GROUP_NORMAL
+        self._poll_keys[key] = poll_group
+        if (
+            poll_group != POLL_GROUP_NORMAL
+            and poll_group not in self._unsub_poll_groups
+        ):
+            self._unsub_poll_groups[poll_group] = async_track_time_interval(
+                self.hass,
+                partial(self._async_refresh_poll_group, poll_group),
+                timedelta(seconds=self._poll_group_intervals[poll_group]),
+                name=f"{self.name}_{poll_group}",
+            )
+        return partial(self._poll_keys.pop, key, None)
+
+    def _get_section_owners(self) -> dict[str, str]:
+        """Return poll group updating each status API section.
+
+        Section (eg. powerValues) can contain values of entities from several
+        groups, it's read only by the fastest of them.
+        """
+        owners: dict[str, str] = {}
+        for key, poll_group in self._poll_keys.items():
+            section = get_status_section(key)
+            if section is None or (
+                section == INPUTS_SECTION and self._input_watcher is not None
+            ):
+                continue
+            owner = owners.get(section)
+            if owner is None or POLL_GROUPS.index(poll_group) < POLL_GROUPS.index(
+                owner
+            ):
+                owners[section] = poll_group
+        return owners
+
+    def _get_poll_group_sections(self, poll_group: str) -> set[str]:
+        """Return status API sections read by poll group."""
+        return {
+            section
+            for section, owner in self._get_section_owners().items()
+            if owner == poll_group
+        }
+
+    async def _async_refresh_poll_group(self, poll_group: str, _now: datetime) -> None:
+        """Update only sections of given poll group and merge them into data."""
+        if (
+            poll_group in self._pending_poll_groups
+            or self.data is None
+            or self.data.stale_since is not None
+            or self._circuit_open
+            or not self.last_update_success
+            or not (sections := self._get_poll_group_sections(poll_group))
+        ):
+            return
+        self._pending_poll_groups.add(poll_group)
+        try:
+            data = await self._async_timed_poll(
+                partial(
+                    self._async_read_url,
+                    STATUS_API_PATH + "?" + "&".join(sorted(sections)),
+                )
+            )
+        except TinyToolsError as exc:
+            self.poll_errors += 1
+            # Regular update takes care of errors and availability.
+            LOGGER.debug("Failed to update %s poll group: %s", poll_group, exc)
+            return
+        finally:
+            self._pending_poll_groups.discard(poll_group)
+        data = self.transforms.apply(data)
+        if self._exporter is not None:
+            self._exporter.add(data)
+        state = {**self.data.state, **data}
+        self._async_run_rules(state)
+        if state.keys() != self.data.state.keys():
+            self.keys_version += 1
+        if state != self.data.state:
+            # Don't use async_set_updated_data, as it would reschedule regular update.
+            self.data = replace(
+                self.data, state=state, energy=self._energy.update(state)
+            )
+            self.async_update_listeners()
+
+    @callback
+    def _async_check_changes(self, data: dict) -> None:
+        """Detect new firmware or changed set of readings of device."""
+        if data.keys() != self.data.state.keys():
+            LOGGER.debug("Readings of %s have changed", self.client.host)
+            self.keys_version += 1
+        software_version = data.get("software_version")
+        if software_version and software_version != self.data.software_version:
+            LOGGER.info(
+                "Software of %s has changed (%s -> %s)",
+                self.client.host,
+                self.data.software_version,
+                software_version,
+            )
+            self.client.software_version = software_version
+            self.__dict__.pop("device_info", None)
+            if self._recorder is not None:
+                self._recorder.async_start_capture(
+                    self._get_capture_name(software_version),
+                    {**self._recorder.metadata, "software_version": software_version},
+                )
+            # Entry update doesn't reload it, as options don't change.
+            self.hass.config_entries.async_update_entry(
+                self.config_entry,
+                data={**self.config_entry.data, ATTR_SW_VERSION: software_version},
+            )
+            device_registry = dr.async_get(self.hass)
+            if device := device_registry.async_get_device(
+                identifiers={(DOMAIN, self.data.mac)}
+            ):
+                device_registry.async_update_device(
+                    device.id, sw_version=software_version
+                )
+
+    @callback
+    def _async_run_rules(self, state: dict) -> None:
+        """Execute actions of threshold rules triggered by state."""
+        for rule in self._rules.evaluate(state):
+            LOGGER.info(
+                "Rule for %s triggered on %s, setting %s to %s",
+                rule.key,
+                self.client.host,
+                rule.target,
+                rule.value,
+            )
+            self.config_entry.async_create_background_task(
+                self.hass,
+                self._async_run_rule_action(rule),
+                name=f"{self.name}_rule_{rule.target}",
+            )
+
+    async def _async_run_rule_action(self, rule: ThresholdRule) -> None:
+        """Set target of rule and refresh data."""
+        try:
+            await self.async_send_command(rule.set_fn, rule.value)
+        except TinyToolsError as exc:
+            LOGGER.warning("Failed to set %s by rule: %s", rule.target, exc)
+            return
+        await self.async_request_refresh()
+
+    @callback
+    def async_start_sampling(self) -> None:
+        """Start high-rate sampling of readings (if enabled)."""
+        if self._sampler is None or self._unsub_sampling is not None:
+            return
+        self._unsub_sampling = async_track_time_interval(
+            self.hass,
+            self._async_sample,
+            timedelta(seconds=self._sampling_interval),
+            name=f"{self.name}_sampling",
+        )
+
+    @callback
+    def async_start_input_watcher(self) -> None:
+        """Start fast watching of digital inputs (if enabled)."""
+        if self._input_watcher is None or self._unsub_inputs is not None:
+            return
+        # Inputs read by the first update are their initial (stable) state.
+        self._input_watcher.update(self.data.state, time.monotonic())
+        self._unsub_inputs = async_track_time_interval(
+            self.hass,
+            self._async_watch_inputs,
+            timedelta(seconds=self._input_interval),
+            name=f"{self.name}_inputs",
+        )
+
+    async def _async_watch_inputs(self, _now: datetime) -> None:
+        """Read only digital inputs and report their (debounced) changes."""
+        if (
+            self._inputs_pending
+            or self._circuit_open
+            or not self.last_update_success
+            or self.data is None
+        ):
+            return
+        self._inputs_pending = True
+        try:
+            data = await self.request_queue.async_poll(
+                partial(self._async_read_url, f"{STATUS_API_PATH}?{INPUTS_SECTION}")
+            )
+        except TinyToolsError as exc:
+            LOGGER.debug("Failed to read inputs: %s", exc)
+            return
+        finally:
+            self._inputs_pending = False
+        if not (changes := self._input_watcher.update(data, time.monotonic())):
+            return
+        for key, value in changes.items():
+            self.hass.bus.async_fire(
+                EVENT_INPUT_CHANGED,
+                {
+                    CONF_MAC: self.data.mac,
+                    ATTR_INPUT: f"id{key.removeprefix(INPUT_KEY_PREFIX)}",
+                    ATTR_STATE: bool(value),
+                },
+            )
+        # Don't use async_set_updated_data, as it would reschedule regular update.
+        self.data = replace(self.data, state={**self.data.state, **changes})
+        self.async_update_listeners()
+
+    @callback
+    def async_start_export(self) -> None:
+        """Start periodic writes of exported readings (if enabled)."""
+        if self._exporter is not None:
+            self._exporter.async_start()
+
+    async def _async_sample(self, _now: datetime) -> None:
+        """Read sampled values and add them to ring buffers."""
+        if self._sample_pending or self._circuit_open or not self.last_update_success:
+            return
+        self._sample_pending = True
+        try:
+            data = await self.request_queue.async_poll(
+                partial(self._async_read_url, f"{STATUS_API_PATH}?powerValues")
+            )
+        except TinyToolsError as exc:
+            LOGGER.debug("Failed to sample readings: %s", exc)
+            return
+        finally:
+            self._sample_pending = False
+        self._sampler.add(data)
+
+    async def async_send_command(
+        self, set_fn: Callable[[DeviceModel, Any], Awaitable], value: Any
+    ) -> None:
+        """Send command to device ahead of polls and measure its latency."""
+        start = time.monotonic()
+        try:
+            await self.request_queue.async_command(partial(set_fn, self.client, value))
+        finally:
+            self.command_latency = time.monotonic() - start
+            LOGGER.debug(
+                "Command for %s took %.3f s", self.client.host, self.command_latency
+            )
+
+    async def async_shutdown(self) -> None:
+        """Cancel all updates, save energy, exports, captures and release worker."""
+        await super().async_shutdown()
+        # Fetches are shielded from cancelling of refresh, cancel them explicitly.
+        if tasks := [
+            task
+            for task in (self._fetch_task, self._followup_fetch_task)
+            if task is not None
+        ]:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            self._fetch_task = self._followup_fetch_task = None
+        for unsub in self._unsub_poll_groups.values():
+            unsub()
+        self._unsub_poll_groups.clear()
+        if self._unsub_sampling is not None:
+            self._unsub_sampling()
+            self._unsub_sampling = None
+        if self._unsub_inputs is not None:
+            self._unsub_inputs()
+            self._unsub_inputs = None
+        await self._energy.async_save()
+        if self._exporter is not None:
+            await self._exporter.async_stop()
+        if self._recorder is not None:
+            await self._recorder.async_save()
+        if self._recorder_session is not None:
+            await self._recorder_session.close()
+            self._recorder_session = None
+        if self._worker is not None:
+            self._worker_device = None
+            await async_release_worker(self.hass, self._worker)
+            self._worker = None
+
+    def _get_stale_data(self) -> TinycontrolData | None:
+        """Return last good data marked as stale if grace period didn't pass yet."""
+        if self.data is None or not (self._stale_polls or self._stale_timeout):
+            return None
+        stale_since = self.data.stale_since or dt_util.utcnow()
+        if self._stale_polls and self._failed_polls > self._stale_polls:
+            return None
+        if (
+            self._stale_timeout
+            and (dt_util.utcnow() - stale_since).total_seconds() > self._stale_timeout
+        ):
+            return None
+        return replace(self.data, stale_since=stale_since)
+
+    async def _async_probe_connection(self) -> None:
+        """Check if device accepts TCP connections (much cheaper than full update)."""
+        try:
+            async with asyncio.timeout(CIRCUIT_BREAKER_PROBE_TIMEOUT):
+                _, writer = await asyncio.open_connection(
+                    self.client.host, self.client.port
+                )
+            writer.close()
+            await writer.wait_closed()
+        except (OSError, TimeoutError) as exc:
+            raise TinyToolsRequestConnectionError("Device is not reachable") from exc
+
+    def _open_circuit(self) -> None:
+        """Replace full updates with connection probes, retried less and less often."""
+        if not self._circuit_open:
+            LOGGER.info(
+                "Device %s:%s does not respond, switching to connection checks",
+                self.client.host,
+                self.client.port,
+            )
+            self._circuit_open = True
+            self.update_interval = self._scan_interval
+        self.update_interval = min(
+            self.update_interval * 2,
+            max(CIRCUIT_BREAKER_MAX_INTERVAL, self._scan_interval),
+        )
+
+    def _close_circuit(self) -> None:
+        """Restore regular full updates."""
+        LOGGER.info(
+            "Device %s:%s is reachable again, restoring updates",
+            self.client.host,
+            self.client.port,
+        )
+        self._circuit_open = False
+        self.update_interval = self._scan_interval
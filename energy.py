@@ -0,0 +1,67 @@
+"""Energy integrated from power readings.
+
+Some devices report powerX but not matching energyX, so energy is integrated
+locally (trapezoidal rule between updates) and totals are persisted.
+"""
+
+import time
+
+from homeassistant.core import HomeAssistant
+from homeassistant.helpers.storage import Store
+
+from .const import DOMAIN
+
+STORAGE_VERSION = 1
+# Number of power/energy channels of devices.
+POWER_CHANNELS = range(1, 7)
+# Gaps (in update intervals) longer than this are not integrated.
+MAX_GAP_INTERVALS = 3
+SAVE_DELAY = 60
+
+
+def _get_store(hass: HomeAssistant, entry_id: str) -> Store[dict[str, float]]:
+    return Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry_id}.energy")
+
+
+async def async_remove_energy(hass: HomeAssistant, entry_id: str) -> None:
+    """Remove persisted totals of device (when its entry is removed)."""
+    await _get_store(hass, entry_id).async_remove()
+
+
+class TinycontrolEnergyIntegrator:
+    """Integrate energy [kWh] from power [kW] readings of a single device."""
+
+    def __init__(self, hass: HomeAssistant, entry_id: str, interval: float) -> None:
+        self._store = _get_store(hass, entry_id)
+        self._max_gap = interval * MAX_GAP_INTERVALS
+        self.totals: dict[str, float] = {}
+        self._last: dict[str, tuple[float, float]] = {}
+
+    async def async_load(self) -> None:
+        """Load persisted totals."""
+        self.totals = await self._store.async_load() or {}
+
+    def update(self, state: dict) -> dict[str, float]:
+        """Add energy since previous readings and return totals by power key."""
+        now = time.monotonic()
+        changed = False
+        for index in POWER_CHANNELS:
+            key = f"power{index}"
+            if (power := state.get(key)) is None or f"energy{index}" in state:
+                continue
+            self.totals.setdefault(key, 0.0)
+            last = self._last.get(key)
+            self._last[key] = (now, power)
+            if last is None or now - last[0] > self._max_gap:
+                # Start of integration (eg. after restart) or gap in readings.
+                continue
+            self.totals[key] += (last[1] + power) / 2 * (now - last[0]) / 3600
+            changed = True
+        if changed:
+            self._store.async_delay_save(lambda: self.totals, SAVE_DELAY)
+        return dict(self.totals)
+
+    async def async_save(self) -> None:
+        """Save totals right away (on unload)."""
+        if self.totals:
+            await self._store.async_save(self.totals)
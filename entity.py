@@ -1,17 +1,103 @@
 """Base entity for tinycontrol integration."""
 
-from homeassistant.const import CONF_MAC, ATTR_CONNECTIONS
-from homeassistant.helpers.device_registry import (
-    CONNECTION_NETWORK_MAC,
-    DeviceInfo,
-    format_mac,
-)
+from collections.abc import Callable, Iterable
+from typing import Any
+
+from homeassistant.core import callback
+from homeassistant.helpers import entity_registry as er
+from homeassistant.helpers.entity import EntityDescription
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
-from .const import DOMAIN
+from .const import ATTR_STALE_SINCE, COMPACT_GROUPS, CONF_COMPACT, CONF_PROMOTED
 from .coordinator import TinycontrolCoordinator
 
 
+def get_compact_group(key: str) -> str | None:
+    """Return group of channel (eg. ds for ds1) in compact mode."""
+    group = key.rstrip("0123456789")
+    return group if group != key and group in COMPACT_GROUPS else None
+
+
+def is_compacted(coordinator: TinycontrolCoordinator, key: str) -> bool:
+    """Check if channel is shown only in its group (compact mode, not promoted)."""
+    return (
+        coordinator.options.get(CONF_COMPACT, False)
+        and get_compact_group(key) is not None
+        and key not in coordinator.options.get(CONF_PROMOTED, [])
+    )
+
+
+@callback
+def async_remove_compacted_entities(coordinator: TinycontrolCoordinator) -> None:
+    """Remove registry entries of channels that are shown only in their groups."""
+    if not coordinator.options.get(CONF_COMPACT, False):
+        return
+    entity_registry = er.async_get(coordinator.hass)
+    prefix = f"{coordinator.data.mac}_"
+    for entity_entry in er.async_entries_for_config_entry(
+        entity_registry, coordinator.config_entry.entry_id
+    ):
+        if entity_entry.unique_id.startswith(prefix) and is_compacted(
+            coordinator, entity_entry.unique_id.removeprefix(prefix)
+        ):
+            entity_registry.async_remove(entity_entry.entity_id)
+
+
+@callback
+def async_add_dynamic_entities(
+    coordinator: TinycontrolCoordinator,
+    async_add_entities: AddEntitiesCallback,
+    descriptions: Iterable[EntityDescription],
+    entity_factory: Callable[
+        [TinycontrolCoordinator, EntityDescription], "TinycontrolEntity"
+    ],
+) -> None:
+    """Add entities available in data and keep them in sync with its keys.
+
+    When set of readings changes (eg. after firmware upgrade) only entities of
+    affected descriptions are added or removed, without reloading entry.
+    In compact mode, channels of groups are added only when promoted.
+    """
+    descriptions = [
+        description
+        for description in descriptions
+        if not is_compacted(coordinator, description.key)
+    ]
+    entities: dict[str, TinycontrolEntity] = {}
+    keys_version: int | None = None
+
+    @callback
+    def _async_reconcile() -> None:
+        nonlocal keys_version
+        if keys_version == coordinator.keys_version or coordinator.data is None:
+            return
+        keys_version = coordinator.keys_version
+        new_entities = []
+        for description in descriptions:
+            available = description.has_fn(coordinator.data)
+            if available and description.key not in entities:
+                entity = entities[description.key] = entity_factory(
+                    coordinator, description
+                )
+                new_entities.append(entity)
+            elif not available and description.key in entities:
+                entity = entities.pop(description.key)
+                if entity.registry_entry is not None:
+                    # Entity is removed together with its registry entry, so it
+                    # isn't left behind as unavailable.
+                    er.async_get(coordinator.hass).async_remove(entity.entity_id)
+                else:
+                    coordinator.hass.async_create_task(entity.async_remove())
+        if new_entities:
+            async_add_entities(new_entities)
+
+    _async_reconcile()
+    coordinator.config_entry.async_on_unload(
+        coordinator.async_add_listener(_async_reconcile)
+    )
+
+
 class TinycontrolEntity(CoordinatorEntity[TinycontrolCoordinator]):
     """Defines a base tinycontrol entity."""
 
@@ -20,14 +106,27 @@ class TinycontrolEntity(CoordinatorEntity[TinycontrolCoordinator]):
     def __init__(self, coordinator: TinycontrolCoordinator) -> None:
         """Initialize the tinycontrol entity."""
         super().__init__(coordinator=coordinator)
-        self._attr_device_info = DeviceInfo(
-            identifiers={(DOMAIN, coordinator.data.mac)},
-            manufacturer="tinycontrol",
-            model=coordinator.data.model,
-            sw_version=coordinator.data.software_version,
-            hw_version=coordinator.data.hardware_version,
+        self._attr_device_info = coordinator.device_info
+
+    async def async_added_to_hass(self) -> None:
+        """Register entity in its poll group when added to hass."""
+        await super().async_added_to_hass()
+        self.async_on_remove(
+            self.coordinator.async_register_poll_key(
+                self.entity_description.key, self.entity_description.poll_group
+            )
+        )
+
+    @property
+    def available(self) -> bool:
+        """Return if entity is available (and its reading is still provided)."""
+        return super().available and self.entity_description.has_fn(
+            self.coordinator.data
         )
-        if (mac := coordinator.config_entry.data.get(CONF_MAC)) is not None:
-            self._attr_device_info[ATTR_CONNECTIONS] = {
-                (CONNECTION_NETWORK_MAC, format_mac(mac))
-            }
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return time since data is stale (device doesn't respond)."""
+        if (stale_since := self.coordinator.data.stale_since) is None:
+            return None
+        return {ATTR_STALE_SINCE: stale_since.isoformat()}
@@ -0,0 +1,109 @@
+"""Export of raw readings to local files.
+
+Every update of device is appended as a line in InfluxDB line protocol. Lines
+are buffered and written in batches (in executor) to gzip-compressed files,
+rotated daily and removed after retention time.
+"""
+
+import asyncio
+import gzip
+import math
+import time
+from datetime import date, datetime, timedelta
+from pathlib import Path
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.event import async_track_time_interval
+from homeassistant.util import dt as dt_util
+
+from .const import DOMAIN, LOGGER
+
+EXPORT_DIRECTORY = f"{DOMAIN}_export"
+EXPORT_SUFFIX = ".lp.gz"
+# Buffered lines are written when there are enough of them or after interval.
+FLUSH_LINES = 500
+FLUSH_INTERVAL = timedelta(minutes=1)
+
+
+class TinycontrolExporter:
+    """Buffered export of readings of a single device."""
+
+    def __init__(self, hass: HomeAssistant, mac: str, retention: int) -> None:
+        self._hass = hass
+        self._directory = Path(hass.config.path(EXPORT_DIRECTORY))
+        self._prefix = mac.replace(":", "")
+        self._tags = f"{DOMAIN},mac={mac}"
+        self._retention = retention
+        self._buffer: list[str] = []
+        self._lock = asyncio.Lock()
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    @callback
+    def async_start(self) -> None:
+        """Start writing buffered lines periodically."""
+        if self._unsub_flush is not None:
+            return
+        self._unsub_flush = async_track_time_interval(
+            self._hass,
+            self._async_flush_interval,
+            FLUSH_INTERVAL,
+            name=f"{DOMAIN}_{self._prefix}_export",
+        )
+
+    async def async_stop(self) -> None:
+        """Stop periodic writes and write remaining lines."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        await self.async_flush()
+
+    @callback
+    def add(self, state: dict) -> None:
+        """Add numeric readings from state as a single line."""
+        fields = ",".join(
+            f"{key}={float(value)!r}"
+            for key, value in state.items()
+            if isinstance(value, (int, float)) and math.isfinite(value)
+        )
+        if not fields:
+            return
+        self._buffer.append(f"{self._tags} {fields} {time.time_ns()}\n")
+        if len(self._buffer) >= FLUSH_LINES and not self._lock.locked():
+            self._hass.async_create_task(self.async_flush())
+
+    async def _async_flush_interval(self, _now: datetime) -> None:
+        """Write buffered lines on interval."""
+        await self.async_flush()
+
+    async def async_flush(self) -> None:
+        """Write buffered lines to file of current day."""
+        async with self._lock:
+            if not self._buffer:
+                return
+            lines, self._buffer = self._buffer, []
+            try:
+                await self._hass.async_add_executor_job(self._write, lines)
+            except OSError as exc:
+                LOGGER.warning("Failed to export readings of %s: %s", self._prefix, exc)
+
+    def _write(self, lines: list[str]) -> None:
+        """Append lines to gzip file (as new gzip member) and rotate old files."""
+        today = dt_util.utcnow().date()
+        path = self._directory / f"{self._prefix}-{today.isoformat()}{EXPORT_SUFFIX}"
+        rotated = not path.exists()
+        self._directory.mkdir(parents=True, exist_ok=True)
+        with gzip.open(path, "at", encoding="utf-8") as file:
+            file.writelines(lines)
+        if rotated and self._retention:
+            self._remove_expired(today)
+
+    def _remove_expired(self, today: date) -> None:
+        """Remove files older than retention days."""
+        for path in self._directory.glob(f"{self._prefix}-*{EXPORT_SUFFIX}"):
+            day = path.name[len(self._prefix) + 1 : -len(EXPORT_SUFFIX)]
+            try:
+                expired = (today - date.fromisoformat(day)).days > self._retention
+            except ValueError:
+                continue
+            if expired:
+                path.unlink(missing_ok=True)
@@ -0,0 +1,43 @@
+"""Fast watching of digital inputs (iD).
+
+Inputs used eg. for door contacts can't wait for regular update, so only their
+section of status API is read with short interval. Change of input is reported
+only when new state is kept for debounce time, which filters contact bounce.
+"""
+
+from typing import Any
+
+# Keys of inputs in data and section of status API with them.
+INPUT_KEY_PREFIX = "iDValue"
+INPUTS_SECTION = "iDValues"
+
+
+class TinycontrolInputWatcher:
+    """Debounce states of digital inputs of a single device."""
+
+    def __init__(self, debounce: float) -> None:
+        self._debounce = debounce
+        self._stable: dict[str, Any] = {}
+        self._pending: dict[str, tuple[Any, float]] = {}
+
+    def update(self, values: dict, now: float) -> dict[str, Any]:
+        """Return inputs, whose new state is kept for debounce time."""
+        changes = {}
+        for key, value in values.items():
+            if not key.startswith(INPUT_KEY_PREFIX):
+                continue
+            if key not in self._stable:
+                # Initial state - nothing has changed yet.
+                self._stable[key] = value
+                continue
+            if value == self._stable[key]:
+                self._pending.pop(key, None)
+                continue
+            pending = self._pending.get(key)
+            if pending is None or pending[0] != value:
+                pending = self._pending[key] = (value, now)
+            if now - pending[1] >= self._debounce:
+                self._stable[key] = value
+                del self._pending[key]
+                changes[key] = value
+        return changes
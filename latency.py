@@ -0,0 +1,91 @@
+"""Adaptive timeouts and hedging of reads from device.
+
+Latency of recent reads is tracked per request and timeout of each read is
+derived from it (few times p95, within limits), so a single slow response
+doesn't stall update for the whole client timeout. Optionally, read that
+takes longer than p95 is hedged - sent again (on another connection) and the
+first successful response is used. Reads of data are idempotent, so it's safe.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from tinytoolslib.exceptions import TinyToolsRequestConnectionError
+
+from .sampling import RingBuffer
+
+_T = TypeVar("_T")
+
+LATENCY_SAMPLES = 100
+# Timeouts are adaptive only when enough latencies are known.
+MIN_LATENCY_SAMPLES = 20
+TIMEOUT_P95_FACTOR = 4
+MIN_READ_TIMEOUT = 1.0
+MAX_READ_TIMEOUT = 30.0
+
+
+class TinycontrolReader:
+    """Run reads of a single device with adaptive timeouts (and hedging)."""
+
+    def __init__(self, hedge: bool = False) -> None:
+        self._hedge = hedge
+        self._latencies: dict[str, RingBuffer] = {}
+
+    def get_p95(self, key: str) -> float | None:
+        """Return p95 latency of request (if enough latencies are known)."""
+        latencies = self._latencies.get(key)
+        if latencies is None or len(latencies) < MIN_LATENCY_SAMPLES:
+            return None
+        return latencies.percentile(0.95)
+
+    async def async_read(self, key: str, job: Callable[[], Awaitable[_T]]) -> _T:
+        """Run read identified by key (eg. URL) and track its latency."""
+        if key not in self._latencies:
+            self._latencies[key] = RingBuffer(LATENCY_SAMPLES)
+        start = time.monotonic()
+        if (p95 := self.get_p95(key)) is None:
+            result = await job()
+        else:
+            timeout = min(
+                max(p95 * TIMEOUT_P95_FACTOR, MIN_READ_TIMEOUT), MAX_READ_TIMEOUT
+            )
+            try:
+                async with asyncio.timeout(timeout):
+                    if self._hedge:
+                        result = await self._async_hedged(job, p95)
+                    else:
+                        result = await job()
+            except TimeoutError as exc:
+                # Keep timeouts in latencies, so timeout grows on slower link.
+                self._latencies[key].append(time.monotonic() - start)
+                raise TinyToolsRequestConnectionError(
+                    f"Read of {key} timed out after {timeout:.1f} s"
+                ) from exc
+        self._latencies[key].append(time.monotonic() - start)
+        return result
+
+    async def _async_hedged(self, job: Callable[[], Awaitable[_T]], delay: float) -> _T:
+        """Run job and run it again when it takes longer than delay.
+
+        Result of the first successful run is returned, the other one is cancelled.
+        """
+        first = asyncio.ensure_future(job())
+        tasks = {first}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=delay)
+            if not done:
+                tasks.add(asyncio.ensure_future(job()))
+            while tasks:
+                done, tasks = await asyncio.wait(
+                    tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        return task.result()
+            # Both runs have failed.
+            return first.result()
+        finally:
+            for task in tasks:
+                task.cancel()
@@ -0,0 +1,131 @@
+"""Metrics of tinycontrol devices in Prometheus exposition format.
+
+Metrics are served by HTTP view (/api/tinycontrol/metrics, authenticated with
+long-lived access token) from data already held by coordinators, so scrapes
+never send requests to devices. Text of each device is cached until its data
+or poll counters change.
+"""
+
+from aiohttp import web
+
+from homeassistant.components.http import KEY_HASS, HomeAssistantView
+from homeassistant.core import HomeAssistant, callback
+
+from .const import DOMAIN
+from .coordinator import (
+    TinycontrolCoordinator,
+    TinycontrolData,
+    async_get_coordinators,
+)
+
+METRICS_URL = f"/api/{DOMAIN}/metrics"
+METRICS_VIEW_KEY = f"{DOMAIN}_metrics_view"
+
+METRIC_READING = f"{DOMAIN}_reading"
+METRIC_UP = f"{DOMAIN}_up"
+METRIC_POLL_LATENCY = f"{DOMAIN}_poll_latency_seconds"
+METRIC_POLLS = f"{DOMAIN}_polls_total"
+METRIC_POLL_ERRORS = f"{DOMAIN}_poll_errors_total"
+# Metric name: (type, help).
+METRICS = {
+    METRIC_READING: ("gauge", "Latest reading of device by key."),
+    METRIC_UP: ("gauge", "Whether the last update of device succeeded."),
+    METRIC_POLL_LATENCY: ("gauge", "Duration of the last update of device."),
+    METRIC_POLLS: ("counter", "Number of successful updates of device."),
+    METRIC_POLL_ERRORS: ("counter", "Number of failed updates of device."),
+}
+
+
+def _escape(value: str) -> str:
+    """Escape label value."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def render_device_metrics(coordinator: TinycontrolCoordinator) -> dict[str, str]:
+    """Return samples of device by metric name."""
+    data = coordinator.data
+    labels = (
+        f'mac="{_escape(data.mac)}",model="{_escape(data.model)}",'
+        f'host="{_escape(coordinator.client.host)}"'
+    )
+    readings = "".join(
+        f'{METRIC_READING}{{{labels},key="{_escape(key)}"}} {float(value)!r}\n'
+        for key, value in data.state.items()
+        if isinstance(value, (int, float))
+    )
+    up = int(coordinator.last_update_success)
+    metrics = {
+        METRIC_READING: readings,
+        METRIC_UP: f"{METRIC_UP}{{{labels}}} {up}\n",
+        METRIC_POLLS: f"{METRIC_POLLS}{{{labels}}} {coordinator.poll_count}\n",
+        METRIC_POLL_ERRORS: (
+            f"{METRIC_POLL_ERRORS}{{{labels}}} {coordinator.poll_errors}\n"
+        ),
+    }
+    if coordinator.poll_latency is not None:
+        metrics[METRIC_POLL_LATENCY] = (
+            f"{METRIC_POLL_LATENCY}{{{labels}}} {coordinator.poll_latency!r}\n"
+        )
+    return metrics
+
+
+class TinycontrolMetricsView(HomeAssistantView):
+    """Serve metrics of all tinycontrol devices."""
+
+    url = METRICS_URL
+    name = f"api:{DOMAIN}:metrics"
+
+    def __init__(self) -> None:
+        """Initialize view with empty cache."""
+        self._cache: dict[str, tuple[TinycontrolData, tuple, dict[str, str]]] = {}
+
+    @callback
+    def _get_device_metrics(
+        self, coordinator: TinycontrolCoordinator
+    ) -> dict[str, str]:
+        """Return cached metrics of device, rendered again only when it changes."""
+        counters = (
+            coordinator.last_update_success,
+            coordinator.poll_count,
+            coordinator.poll_errors,
+        )
+        entry_id = coordinator.config_entry.entry_id
+        cached = self._cache.get(entry_id)
+        if cached is None or cached[0] is not coordinator.data or cached[1] != counters:
+            cached = self._cache[entry_id] = (
+                coordinator.data,
+                counters,
+                render_device_metrics(coordinator),
+            )
+        return cached[2]
+
+    async def get(self, request: web.Request) -> web.Response:
+        """Return metrics in Prometheus exposition format."""
+        coordinators = [
+            coordinator
+            for coordinator in async_get_coordinators(request.app[KEY_HASS])
+            if coordinator.data is not None
+        ]
+        devices = [
+            self._get_device_metrics(coordinator) for coordinator in coordinators
+        ]
+        # Forget devices that were removed.
+        for entry_id in self._cache.keys() - {
+            coordinator.config_entry.entry_id for coordinator in coordinators
+        }:
+            del self._cache[entry_id]
+        lines = []
+        for metric, (metric_type, description) in METRICS.items():
+            lines.append(f"# HELP {metric} {description}\n")
+            lines.append(f"# TYPE {metric} {metric_type}\n")
+            lines.extend(device.get(metric, "") for device in devices)
+        return web.Response(text="".join(lines), content_type="text/plain")
+
+
+@callback
+def async_setup_metrics(hass: HomeAssistant) -> None:
+    """Register metrics view (once - views can't be removed)."""
+    if METRICS_VIEW_KEY in hass.data:
+        return
+    hass.http.register_view(TinycontrolMetricsView())
+    hass.data[METRICS_VIEW_KEY] = True
@@ -0,0 +1,129 @@
+"""Support for tinycontrol numbers."""
+
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from functools import partial
+from typing import Any
+
+from homeassistant.components.number import (
+    NumberEntity,
+    NumberEntityDescription,
+    NumberMode,
+)
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import PERCENTAGE
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from tinytoolslib.models import DeviceModel
+
+from .const import DOMAIN, POLL_GROUP_NORMAL
+from .coordinator import TinycontrolData, TinycontrolCoordinator, TinyToolsError
+from .entity import TinycontrolEntity, async_add_dynamic_entities
+
+
+@dataclass(frozen=True, kw_only=True)
+class TinycontrolNumberEntityDescription(NumberEntityDescription):
+    """Class describing Tinycontrol number entities."""
+
+    entity_registry_enabled_default: bool = False
+    poll_group: str = POLL_GROUP_NORMAL
+    has_fn: Callable[[TinycontrolData], bool] = lambda _: True
+    value_fn: Callable[[TinycontrolData], float | None]
+    set_fn: Callable[[DeviceModel, float], Awaitable[Any]]
+
+
+NUMBERS = [
+    *[
+        TinycontrolNumberEntityDescription(
+            key=f"pwmDuty{i}",
+            name=f"PWM{i} duty",
+            native_min_value=0,
+            native_max_value=100,
+            native_step=1,
+            native_unit_of_measurement=PERCENTAGE,
+            mode=NumberMode.SLIDER,
+            has_fn=lambda x, _i=i: f"pwmDuty{_i}" in x.state,
+            value_fn=lambda x, _i=i: x.state[f"pwmDuty{_i}"],
+            # tinytoolslib has no async variant of set_pwm_duty.
+            set_fn=lambda client, value, _i=i: client.async_get(
+                client._set_pwm_duty(_i, value)
+            ),
+        )
+        for i in range(4)
+    ],
+]
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up tinycontrol number based on a config entry."""
+    coordinator: TinycontrolCoordinator = hass.data[DOMAIN][entry.entry_id]
+
+    async_add_dynamic_entities(
+        coordinator, async_add_entities, NUMBERS, TinycontrolNumberEntity
+    )
+
+
+class TinycontrolNumberEntity(TinycontrolEntity, NumberEntity):
+    """Defines a tinycontrol number."""
+
+    entity_description: TinycontrolNumberEntityDescription
+
+    def __init__(
+        self,
+        coordinator: TinycontrolCoordinator,
+        description: TinycontrolNumberEntityDescription,
+    ) -> None:
+        """Initiate tinycontrol number."""
+        super().__init__(coordinator)
+
+        self.entity_description = description
+        self._attr_unique_id = f"{coordinator.data.mac}_{description.key}"
+        # Value set by user, shown until it's written and device reports it.
+        self._set_value: float | None = None
+        self._pending_writes = 0
+
+    @property
+    def native_value(self) -> float | None:
+        """Return value of the number."""
+        if self._set_value is not None:
+            return self._set_value
+        return self.entity_description.value_fn(self.coordinator.data)
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Show value reported by device (unless write of set value is pending)."""
+        if (
+            not self._pending_writes
+            or self._set_value
+            == self.entity_description.value_fn(self.coordinator.data)
+        ):
+            self._set_value = None
+        super()._handle_coordinator_update()
+
+    async def async_set_native_value(self, value: float) -> None:
+        """Set value - intermediate values (eg. of slider) are coalesced."""
+        self._set_value = value
+        self.async_write_ha_state()
+        self._pending_writes += 1
+        try:
+            await self.coordinator.write_coalescer.async_write(
+                self.entity_description.key,
+                partial(
+                    self.coordinator.async_send_command,
+                    self.entity_description.set_fn,
+                    value,
+                ),
+            )
+        except TinyToolsError as error:
+            raise HomeAssistantError(
+                "An error occurred while updating the tinycontrol"
+            ) from error
+        finally:
+            self._pending_writes -= 1
+            await self.coordinator.async_request_refresh()
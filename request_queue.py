@@ -0,0 +1,100 @@
+"""Queue of requests to tinycontrol device.
+
+Devices have single-threaded HTTP server, so requests are sent one at a time.
+Commands (eg. switching outputs) have priority over polls - running poll is
+cancelled and repeated after commands, so they don't wait behind slow reads.
+Writes of values set continuously (eg. by slider) are coalesced, so only the
+latest value of each channel is sent, not more often than given interval.
+"""
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable
+from typing import Any, TypeVar
+
+_T = TypeVar("_T")
+
+
+class TinycontrolRequestQueue:
+    """Serialize requests to device, giving commands priority over polls."""
+
+    def __init__(self) -> None:
+        self._lock = asyncio.Lock()
+        self._commands = 0
+        self._no_commands = asyncio.Event()
+        self._no_commands.set()
+        self._poll_task: asyncio.Task | None = None
+        self._poll_preempted = False
+
+    async def async_poll(self, job: Callable[[], Awaitable[_T]]) -> _T:
+        """Run poll when there are no commands to send.
+
+        Poll preempted by command is started again after commands are sent.
+        """
+        while True:
+            await self._no_commands.wait()
+            async with self._lock:
+                if self._commands:
+                    # Command arrived while waiting for lock.
+                    continue
+                self._poll_task = asyncio.ensure_future(job())
+                try:
+                    return await self._poll_task
+                except asyncio.CancelledError:
+                    if not self._poll_preempted:
+                        raise
+                finally:
+                    self._poll_task = None
+                    self._poll_preempted = False
+
+    async def async_command(self, job: Callable[[], Awaitable[_T]]) -> _T:
+        """Run command as soon as possible, cancelling running poll."""
+        self._commands += 1
+        self._no_commands.clear()
+        try:
+            if self._poll_task is not None and not self._poll_task.done():
+                self._poll_preempted = True
+                self._poll_task.cancel()
+            async with self._lock:
+                return await job()
+        finally:
+            self._commands -= 1
+            if not self._commands:
+                self._no_commands.set()
+
+
+class TinycontrolWriteCoalescer:
+    """Send only the latest write of each channel, with bounded rate."""
+
+    def __init__(self, interval: float) -> None:
+        self._interval = interval
+        self._pending: dict[str, Callable[[], Awaitable[Any]]] = {}
+        self._tasks: dict[str, asyncio.Task] = {}
+        self._last_sent: dict[str, float] = {}
+
+    async def async_write(self, key: str, job: Callable[[], Awaitable[Any]]) -> None:
+        """Schedule write of channel, replacing its pending write.
+
+        Returns when the latest write of channel is sent.
+        """
+        self._pending[key] = job
+        if key not in self._tasks:
+            self._tasks[key] = asyncio.ensure_future(self._async_send(key))
+        await asyncio.shield(self._tasks[key])
+
+    async def _async_send(self, key: str) -> None:
+        """Send pending writes of channel until there are none."""
+        try:
+            while key in self._pending:
+                last_sent = self._last_sent.get(key, -self._interval)
+                delay = last_sent + self._interval - time.monotonic()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+                job = self._pending.pop(key)
+                self._last_sent[key] = time.monotonic()
+                await job()
+        except Exception:
+            self._pending.pop(key, None)
+            raise
+        finally:
+            del self._tasks[key]
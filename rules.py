@@ -0,0 +1,107 @@
+"""Threshold rules evaluated right after device update.
+
+Rules are simple protections, eg. turn OUT3 off when ds1 is above 60, that
+are executed by coordinator directly (without state writes and automations).
+Rule is triggered when reading crosses threshold and released only when it
+gets back by hysteresis. While triggered, target is set again (eg. after it
+was switched on manually) but not more often than min_interval.
+"""
+
+import time
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import Any
+
+from tinytoolslib.models import DeviceModel
+
+RULE_KEY = "key"
+RULE_ABOVE = "above"
+RULE_BELOW = "below"
+RULE_HYSTERESIS = "hysteresis"
+RULE_TARGET = "target"
+RULE_VALUE = "value"
+RULE_MIN_INTERVAL = "min_interval"
+DEFAULT_MIN_INTERVAL = 10
+
+# Setters of outputs that can be targets of rules, by key prefix (eg. out3).
+RULE_TARGETS: dict[str, Callable[[DeviceModel, int, int], Awaitable[Any]]] = {
+    "out": lambda client, index, value: client.async_set_out(index, value),
+    "pwm": lambda client, index, value: client.async_set_pwm(index, value),
+    "var": lambda client, index, value: client.async_set_var(index, value),
+}
+
+
+@dataclass(slots=True)
+class ThresholdRule:
+    """Rule setting target output when reading crosses threshold."""
+
+    key: str
+    target: str
+    set_fn: Callable[[DeviceModel, int], Awaitable[Any]]
+    value: int
+    above: float | None
+    below: float | None
+    hysteresis: float
+    min_interval: float
+    triggered: bool = False
+    last_action: float | None = None
+
+    def check(self, reading: float) -> bool:
+        """Update and return whether rule is triggered by reading."""
+        if self.above is not None:
+            threshold = self.above - self.hysteresis if self.triggered else self.above
+            self.triggered = reading > threshold
+        else:
+            threshold = self.below + self.hysteresis if self.triggered else self.below
+            self.triggered = reading < threshold
+        return self.triggered
+
+
+def parse_rule(rule: dict[str, Any]) -> ThresholdRule:
+    """Parse rule from options (raises ValueError/TypeError when it's invalid)."""
+    if not isinstance(rule, dict):
+        raise TypeError("Rule must be a mapping")
+    if (rule.get(RULE_ABOVE) is None) == (rule.get(RULE_BELOW) is None):
+        raise ValueError("Rule needs exactly one of above/below")
+    target = str(rule[RULE_TARGET])
+    prefix = target.rstrip("0123456789")
+    if prefix not in RULE_TARGETS or prefix == target:
+        raise ValueError(f"Unsupported rule target {target}")
+    setter, index = RULE_TARGETS[prefix], int(target[len(prefix) :])
+    return ThresholdRule(
+        key=str(rule[RULE_KEY]),
+        target=target,
+        set_fn=lambda client, value: setter(client, index, value),
+        value=int(rule.get(RULE_VALUE, 0)),
+        above=None if rule.get(RULE_ABOVE) is None else float(rule[RULE_ABOVE]),
+        below=None if rule.get(RULE_BELOW) is None else float(rule[RULE_BELOW]),
+        hysteresis=float(rule.get(RULE_HYSTERESIS, 0)),
+        min_interval=float(rule.get(RULE_MIN_INTERVAL, DEFAULT_MIN_INTERVAL)),
+    )
+
+
+class TinycontrolRuleEngine:
+    """Threshold rules of a single device."""
+
+    def __init__(self, rules: list[dict[str, Any]]) -> None:
+        self._rules = [parse_rule(rule) for rule in rules]
+
+    def evaluate(self, state: dict) -> list[ThresholdRule]:
+        """Return rules, whose target should be set now."""
+        now = time.monotonic()
+        actions = []
+        for rule in self._rules:
+            reading = state.get(rule.key)
+            if not isinstance(reading, (int, float)) or not rule.check(reading):
+                continue
+            if state.get(rule.target) == rule.value:
+                # Target is already set.
+                continue
+            if (
+                rule.last_action is not None
+                and now - rule.last_action < rule.min_interval
+            ):
+                continue
+            rule.last_action = now
+            actions.append(rule)
+        return actions
@@ -0,0 +1,85 @@
+"""High-rate sampling of tcPDU readings.
+
+Samples are kept in fixed-size ring buffers and only aggregates over window
+(between regular updates) are published as sensors.
+"""
+
+import math
+from array import array
+
+# Readings sampled with high rate - only tcPDU power readings for now.
+SAMPLED_KEYS = ("pActive", "iRms", "uRms")
+SAMPLE_STATS = ("min", "max", "mean", "last")
+
+
+class RingBuffer:
+    """Fixed-size buffer of float samples."""
+
+    __slots__ = ("_count", "_data", "_index")
+
+    def __init__(self, size: int) -> None:
+        self._data = array("d", bytes(8 * size))
+        self._index = 0
+        self._count = 0
+
+    def append(self, value: float) -> None:
+        """Add sample, overwriting the oldest one when buffer is full."""
+        self._data[self._index] = value
+        self._index = (self._index + 1) % len(self._data)
+        self._count = min(self._count + 1, len(self._data))
+
+    def __len__(self) -> int:
+        """Return number of samples in buffer."""
+        return self._count
+
+    def percentile(self, fraction: float) -> float | None:
+        """Return percentile (nearest rank, fraction 0-1) of samples in buffer."""
+        if not self._count:
+            return None
+        window = sorted(self._data[: self._count])
+        return window[min(self._count - 1, int(fraction * self._count))]
+
+    def clear(self) -> None:
+        """Start new window."""
+        self._index = 0
+        self._count = 0
+
+    def aggregate(self) -> dict[str, float | None]:
+        """Return min, max, mean and last sample of the window.
+
+        Aggregates are computed by builtins over the whole array, so they run
+        in C regardless of sampling rate.
+        """
+        if not self._count:
+            return dict.fromkeys(SAMPLE_STATS)
+        window = (
+            self._data if self._count == len(self._data) else self._data[: self._count]
+        )
+        return {
+            "min": min(window),
+            "max": max(window),
+            "mean": math.fsum(window) / self._count,
+            "last": self._data[self._index - 1],
+        }
+
+
+class TinycontrolSampler:
+    """Ring buffers of sampled readings of a single device."""
+
+    def __init__(self, size: int) -> None:
+        self._buffers = {key: RingBuffer(size) for key in SAMPLED_KEYS}
+
+    def add(self, values: dict) -> None:
+        """Add samples of readings available in values."""
+        for key, buffer in self._buffers.items():
+            if (value := values.get(key)) is not None:
+                buffer.append(float(value))
+
+    def aggregate(self, state: dict) -> dict[str, dict[str, float | None]]:
+        """Return aggregates of readings available in state and start new window."""
+        samples = {}
+        for key, buffer in self._buffers.items():
+            if key in state:
+                samples[key] = buffer.aggregate()
+                buffer.clear()
+        return samples
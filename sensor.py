@@ -1,7 +1,10 @@
 """Support for tinycontrol sensors."""
 
-from dataclasses import dataclass
-from typing import Callable
+from collections.abc import Callable
+from dataclasses import dataclass, replace
+from datetime import datetime, timedelta
+from fnmatch import fnmatchcase
+from typing import Any
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import (
@@ -16,9 +19,10 @@ from homeassistant.const import (
     UnitOfElectricPotential,
     UnitOfElectricCurrent,
     UnitOfTemperature,
+    UnitOfTime,
     EntityCategory,
 )
-from homeassistant.core import HomeAssistant
+from homeassistant.core import HomeAssistant, callback
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorEntity,
@@ -26,10 +30,31 @@ from homeassistant.components.sensor import (
     SensorStateClass,
 )
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_track_time_interval
 
-from .const import DOMAIN
-from .coordinator import TinycontrolData, TinycontrolCoordinator
-from .entity import TinycontrolEntity
+from .aggregate import TinycontrolAggregateSensor
+from .const import (
+    COMPACT_GROUPS,
+    CONF_COMPACT,
+    CONF_DEADBANDS,
+    CONF_ENTRY_TYPE,
+    CONF_KEYS,
+    CONF_MAX_SILENCE,
+    DEFAULT_MAX_SILENCE,
+    DOMAIN,
+    ENTRY_TYPE_AGGREGATE,
+    ENTRY_TYPE_DEVICE,
+    POLL_GROUP_FAST,
+    POLL_GROUP_NORMAL,
+    POLL_GROUP_SLOW,
+)
+from .coordinator import (
+    TinycontrolCoordinator,
+    TinycontrolData,
+    async_get_coordinators,
+)
+from .entity import TinycontrolEntity, async_add_dynamic_entities, get_compact_group
+from .sampling import SAMPLED_KEYS
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -37,8 +62,15 @@ class TinycontrolSensorEntityDescription(SensorEntityDescription):
     entity_category: str = EntityCategory.DIAGNOSTIC
     entity_registry_enabled_default: bool = False
     state_class: str = SensorStateClass.MEASUREMENT
+    # Minimal change of value (absolute or in % of previous value) to write state.
+    deadband: float | None = None
+    deadband_percent: float | None = None
+    poll_group: str = POLL_GROUP_NORMAL
+    # Key of reading in data, when it differs from key of sensor.
+    reading_key: str | None = None
     has_fn: Callable[[TinycontrolData], bool] = lambda _: True
     value_fn: Callable[[TinycontrolData], float | int | None]
+    attributes_fn: Callable[[TinycontrolData], dict[str, Any]] | None = None
 
 
 SENSORS = [
@@ -49,6 +81,7 @@ SENSORS = [
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_display_precision=1,
+        deadband=0.1,
         has_fn=lambda x: "boardTemp" in x.state,
         value_fn=lambda x: x.state["boardTemp"],
     ),
@@ -59,16 +92,19 @@ SENSORS = [
         device_class=SensorDeviceClass.HUMIDITY,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=0,
+        deadband=1,
         has_fn=lambda x: "boardHum" in x.state,
         value_fn=lambda x: x.state["boardHum"],
     ),
     TinycontrolSensorEntityDescription(
         key="boardVoltage",
         name="boardVoltage",
+        poll_group=POLL_GROUP_SLOW,
         entity_registry_enabled_default=True,
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         suggested_display_precision=2,
+        deadband=0.05,
         has_fn=lambda x: "boardVoltage" in x.state,
         value_fn=lambda x: x.state["boardVoltage"],
     ),
@@ -76,9 +112,11 @@ SENSORS = [
         TinycontrolSensorEntityDescription(
             key=f"ds{i}",
             name=f"DS{i}",
+            poll_group=POLL_GROUP_SLOW,
             device_class=SensorDeviceClass.TEMPERATURE,
             native_unit_of_measurement=UnitOfTemperature.CELSIUS,
             suggested_display_precision=1,
+            deadband=0.1,
             has_fn=lambda x, _i=i: f"ds{_i}" in x.state,
             value_fn=lambda x, _i=i: x.state[f"ds{_i}"],
         )
@@ -90,6 +128,7 @@ SENSORS = [
         device_class=SensorDeviceClass.TEMPERATURE,
         native_unit_of_measurement=UnitOfTemperature.CELSIUS,
         suggested_display_precision=1,
+        deadband=0.1,
         has_fn=lambda x: "i2cTemp" in x.state,
         value_fn=lambda x: x.state["i2cTemp"],
     ),
@@ -99,6 +138,7 @@ SENSORS = [
         device_class=SensorDeviceClass.HUMIDITY,
         native_unit_of_measurement=PERCENTAGE,
         suggested_display_precision=1,
+        deadband=0.5,
         has_fn=lambda x: "i2cHum" in x.state,
         value_fn=lambda x: x.state["i2cHum"],
     ),
@@ -108,6 +148,7 @@ SENSORS = [
         device_class=SensorDeviceClass.PRESSURE,
         native_unit_of_measurement=UnitOfPressure.HPA,
         suggested_display_precision=2,
+        deadband=0.1,
         has_fn=lambda x: "i2cPressure" in x.state,
         value_fn=lambda x: x.state["i2cPressure"],
     ),
@@ -157,6 +198,7 @@ SENSORS = [
         value_fn=lambda x: x.state["co2"],
     ),
     # No device_class for diff as they can be temperature, voltage, power, energy, etc.
+    # (it can be set by transform in options).
     *[
         TinycontrolSensorEntityDescription(
             key=f"diff{i}",
@@ -174,6 +216,8 @@ SENSORS = [
             device_class=SensorDeviceClass.VOLTAGE,
             native_unit_of_measurement=UnitOfElectricPotential.VOLT,
             suggested_display_precision=2,
+            deadband=0.02,
+            reading_key=f"iAValue{i}",
             has_fn=lambda x, _i=i: f"iAValue{_i}" in x.state,
             value_fn=lambda x, _i=i: x.state[f"iAValue{_i}"],
         )
@@ -195,6 +239,7 @@ SENSORS = [
         TinycontrolSensorEntityDescription(
             key=f"energy{i}",
             name=f"ENERGY{i}",
+            poll_group=POLL_GROUP_SLOW,
             state_class=SensorStateClass.TOTAL,
             device_class=SensorDeviceClass.ENERGY,
             native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
@@ -204,7 +249,21 @@ SENSORS = [
         )
         for i in range(1, 7)
     ],
-    # No device_class for mX as they can be anything.
+    # Energy integrated from power for devices that don't provide energy.
+    *[
+        TinycontrolSensorEntityDescription(
+            key=f"integratedEnergy{i}",
+            name=f"ENERGY{i} (integrated)",
+            state_class=SensorStateClass.TOTAL,
+            device_class=SensorDeviceClass.ENERGY,
+            native_unit_of_measurement=UnitOfEnergy.KILO_WATT_HOUR,
+            suggested_display_precision=3,
+            has_fn=lambda x, _i=i: f"power{_i}" in x.energy,
+            value_fn=lambda x, _i=i: x.energy[f"power{_i}"],
+        )
+        for i in range(1, 7)
+    ],
+    # No device_class for mX as they can be anything (it can be set by transform).
     *[
         TinycontrolSensorEntityDescription(
             key=f"mValue{i}",
@@ -223,26 +282,31 @@ SENSORS = [
         device_class=SensorDeviceClass.VOLTAGE,
         native_unit_of_measurement=UnitOfElectricPotential.VOLT,
         suggested_display_precision=1,
+        deadband=0.5,
         has_fn=lambda x: "uRms" in x.state,
         value_fn=lambda x: x.state["uRms"],
     ),
     TinycontrolSensorEntityDescription(
         key="iRms",
         name="I RMS",
+        poll_group=POLL_GROUP_FAST,
         entity_registry_enabled_default=True,
         device_class=SensorDeviceClass.CURRENT,
         native_unit_of_measurement=UnitOfElectricCurrent.AMPERE,
         suggested_display_precision=2,
+        deadband_percent=1,
         has_fn=lambda x: "iRms" in x.state,
         value_fn=lambda x: x.state["iRms"],
     ),
     TinycontrolSensorEntityDescription(
         key="pActive",
         name="Power active",
+        poll_group=POLL_GROUP_FAST,
         entity_registry_enabled_default=True,
         device_class=SensorDeviceClass.POWER,
         native_unit_of_measurement=UnitOfPower.WATT,
         suggested_display_precision=3,
+        deadband_percent=1,
         has_fn=lambda x: "pActive" in x.state,
         value_fn=lambda x: x.state["pActive"],
     ),
@@ -253,6 +317,7 @@ SENSORS = [
         device_class=SensorDeviceClass.REACTIVE_POWER,
         native_unit_of_measurement=UnitOfReactivePower.VOLT_AMPERE_REACTIVE,
         suggested_display_precision=3,
+        deadband_percent=1,
         has_fn=lambda x: "pReactive" in x.state,
         value_fn=lambda x: x.state["pReactive"],
     ),
@@ -262,6 +327,7 @@ SENSORS = [
         device_class=SensorDeviceClass.APPARENT_POWER,
         native_unit_of_measurement=UnitOfApparentPower.VOLT_AMPERE,
         suggested_display_precision=3,
+        deadband_percent=1,
         has_fn=lambda x: "pApparent" in x.state,
         value_fn=lambda x: x.state["pApparent"],
     ),
@@ -274,24 +340,139 @@ SENSORS = [
         has_fn=lambda x: "pFactor" in x.state,
         value_fn=lambda x: x.state["pFactor"],
     ),
+    # Integration diagnostics - time of sending last command (including waiting in queue).
+    TinycontrolSensorEntityDescription(
+        key="commandLatency",
+        name="Command latency",
+        device_class=SensorDeviceClass.DURATION,
+        native_unit_of_measurement=UnitOfTime.MILLISECONDS,
+        suggested_display_precision=0,
+        has_fn=lambda x: any(
+            key.startswith(("out", "pwm", "var", "event")) for key in x.state
+        ),
+        value_fn=lambda x: (
+            x.command_latency * 1000 if x.command_latency is not None else None
+        ),
+    ),
 ]
 
 
+# Aggregates of high-rate samples (sampling mode for tcPDU)
+SENSORS.extend(
+    TinycontrolSensorEntityDescription(
+        key=f"{description.key}{stat.capitalize()}",
+        name=f"{description.name} {stat}",
+        device_class=description.device_class,
+        native_unit_of_measurement=description.native_unit_of_measurement,
+        suggested_display_precision=description.suggested_display_precision,
+        has_fn=lambda x, _key=description.key: _key in x.samples,
+        value_fn=lambda x, _key=description.key, _stat=stat: x.samples[_key][_stat],
+    )
+    for description in list(SENSORS)
+    if description.key in SAMPLED_KEYS
+    for stat in ("min", "max", "mean")
+)
+
+
+# Channel groups of compact mode - number of channels as state and their
+# readings in attributes, written at once (and not recorded).
+COMPACT_GROUP_NAMES = {
+    "ds": "DS temperatures",
+    "diff": "DIFF readings",
+    "iA": "iA voltages",
+    "power": "POWER readings",
+    "energy": "ENERGY readings",
+    "mValue": "Custom readings",
+}
+COMPACT_GROUP_MEMBERS = {
+    group: [
+        (description.key, description.has_fn, description.value_fn)
+        for description in SENSORS
+        if get_compact_group(description.key) == group
+    ]
+    for group in COMPACT_GROUPS
+}
+COMPACT_SENSORS = [
+    TinycontrolSensorEntityDescription(
+        key=f"{group}Group",
+        name=COMPACT_GROUP_NAMES[group],
+        entity_category=None,
+        entity_registry_enabled_default=True,
+        state_class=None,
+        has_fn=lambda x, _m=members: any(has_fn(x) for _, has_fn, _ in _m),
+        value_fn=lambda x, _m=members: sum(has_fn(x) for _, has_fn, _ in _m),
+        attributes_fn=lambda x, _m=members: {
+            key: value_fn(x) for key, has_fn, value_fn in _m if has_fn(x)
+        },
+    )
+    for group, members in COMPACT_GROUP_MEMBERS.items()
+]
+
+
+def parse_deadband(value: float | str | None) -> tuple[float | None, float | None]:
+    """Parse deadband from options - number (absolute) or text like "2%" (percent)."""
+    if value is None:
+        return None, None
+    if isinstance(value, str) and value.strip().endswith("%"):
+        return None, float(value.strip()[:-1])
+    return float(value), None
+
+
+def get_reading_description(
+    hass: HomeAssistant, pattern: str
+) -> TinycontrolSensorEntityDescription | None:
+    """Return description of sensor showing readings matching pattern.
+
+    Pattern is matched against keys of readings reported by devices (eg.
+    iAValue*), sensor is the one whose value is that reading. When no device
+    reports matching reading yet, pattern is matched against sensor keys.
+    """
+    descriptions = {
+        description.reading_key or description.key: description
+        for description in SENSORS
+    }
+    keys = {
+        key
+        for coordinator in async_get_coordinators(hass)
+        if coordinator.data is not None
+        for key in coordinator.data.state
+        if fnmatchcase(key, pattern)
+    }
+    for key in sorted(keys):
+        if (description := descriptions.get(key)) is not None:
+            return description
+    return next(
+        (
+            description
+            for description in SENSORS
+            if fnmatchcase(description.key, pattern)
+        ),
+        None,
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     entry: ConfigEntry,
     async_add_entities: AddEntitiesCallback,
 ) -> None:
     """Set up tinycontrol sensor based on a config entry."""
+    if entry.data.get(CONF_ENTRY_TYPE, ENTRY_TYPE_DEVICE) == ENTRY_TYPE_AGGREGATE:
+        description = get_reading_description(hass, entry.data[CONF_KEYS])
+        async_add_entities([TinycontrolAggregateSensor(entry, description)])
+        return
+
     coordinator: TinycontrolCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        TinycontrolSensorEntity(
-            coordinator=coordinator,
-            description=description,
-        )
-        for description in SENSORS
-        if description.has_fn(coordinator.data)
+    async_add_dynamic_entities(
+        coordinator,
+        async_add_entities,
+        (
+            [*SENSORS, *COMPACT_SENSORS]
+            if coordinator.options.get(CONF_COMPACT, False)
+            else SENSORS
+        ),
+        TinycontrolSensorEntity,
     )
 
 
@@ -299,6 +480,11 @@ class TinycontrolSensorEntity(TinycontrolEntity, SensorEntity):
     """TinycontrolSensorEntity."""
 
     entity_description: TinycontrolSensorEntityDescription
+    # Readings of channels in attributes of groups (compact mode) would store
+    # the whole group with every change of any channel.
+    _unrecorded_attributes = frozenset(
+        key for members in COMPACT_GROUP_MEMBERS.values() for key, _, _ in members
+    )
 
     def __init__(
         self,
@@ -308,10 +494,109 @@ class TinycontrolSensorEntity(TinycontrolEntity, SensorEntity):
         """Initiate tinycontrol sensor."""
         super().__init__(coordinator)
 
+        if transform := coordinator.transforms.transforms.get(description.key):
+            # Value is transformed by coordinator, sensor gets unit and classes
+            # that are set by transform (others are kept from description).
+            overrides = {
+                "native_unit_of_measurement": transform.unit,
+                "device_class": transform.device_class,
+                "state_class": transform.state_class,
+            }
+            description = replace(
+                description,
+                **{
+                    name: value
+                    for name, value in overrides.items()
+                    if value is not None
+                },
+            )
         self.entity_description = description
         self._attr_unique_id = f"{coordinator.data.mac}_{description.key}"
+        options = coordinator.config_entry.options
+        if description.key in options.get(CONF_DEADBANDS, {}):
+            self._deadband, self._deadband_percent = parse_deadband(
+                options[CONF_DEADBANDS][description.key]
+            )
+        else:
+            self._deadband = description.deadband
+            self._deadband_percent = description.deadband_percent
+        self._max_silence = options.get(
+            CONF_MAX_SILENCE, DEFAULT_MAX_SILENCE.total_seconds()
+        )
+        self._written_value: float | int | None = None
+        self._written_available: bool | None = None
+        self._written_attributes: dict[str, Any] | None = None
 
     @property
     def native_value(self) -> float | int | None:
         """Return the sensor value."""
         return self.entity_description.value_fn(self.coordinator.data)
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any] | None:
+        """Return readings of channels (group of compact mode) and stale time."""
+        attributes = super().extra_state_attributes
+        if self.entity_description.attributes_fn is None:
+            return attributes
+        return {
+            **self.entity_description.attributes_fn(self.coordinator.data),
+            **(attributes or {}),
+        }
+
+    async def async_added_to_hass(self) -> None:
+        """Start writing value held back by deadband after max silence."""
+        await super().async_added_to_hass()
+        if self._max_silence and (self._deadband or self._deadband_percent):
+            # Coordinator doesn't update entities when data doesn't change.
+            self.async_on_remove(
+                async_track_time_interval(
+                    self.hass,
+                    self._async_write_held_value,
+                    timedelta(seconds=self._max_silence),
+                )
+            )
+
+    @callback
+    def _async_write_held_value(self, _now: datetime) -> None:
+        """Write value that didn't pass deadband since it was last written."""
+        if self.native_value != self._written_value:
+            self.async_write_ha_state()
+
+    @callback
+    def async_write_ha_state(self) -> None:
+        """Write state and remember what was written for deadband filtering."""
+        self._written_value = self.native_value
+        self._written_available = self.available
+        self._written_attributes = self.extra_state_attributes
+        super().async_write_ha_state()
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Write state only when value changes significantly."""
+        if self._is_significant_update():
+            super()._handle_coordinator_update()
+
+    def _is_significant_update(self) -> bool:
+        """Check if update of value passes deadband of the sensor."""
+        if not (self._deadband or self._deadband_percent):
+            return True
+        if (
+            self.available != self._written_available
+            or self.extra_state_attributes != self._written_attributes
+        ):
+            return True
+        value, previous = self.native_value, self._written_value
+        if not isinstance(value, (int, float)) or not isinstance(
+            previous, (int, float)
+        ):
+            return value != previous
+        change = abs(value - previous)
+        if self._deadband and change >= self._deadband:
+            return True
+        if not self._deadband_percent:
+            return False
+        if not previous:
+            # Percent of zero (eg. idle outlet) is zero - any change is significant,
+            # unless absolute deadband is set as well (it was checked above).
+            return not self._deadband and change > 0
+        return change >= abs(previous) * self._deadband_percent / 100
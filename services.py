@@ -3,37 +3,38 @@
 It contains:
 - add_mqtt_device - experimental action for adding devices that uses MQTT for communication,
 so it depends on built-in MQTT integration.
+
+MQTT integration and definitions of MQTT entities are imported only when action
+is called, so setup of integration doesn't load them on installs without MQTT.
 """
 
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
 from homeassistant.exceptions import HomeAssistantError
-from homeassistant.components import mqtt
-from homeassistant.components.mqtt.const import (
-    DOMAIN as MQTT_DOMAIN,
-    CONF_DISCOVERY_PREFIX,
-)
 import json
 from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.helpers.importlib import async_import_module
 from typing import Iterable
-from .mqtt_integration import LK4_MODEL, LK4_SERIES, generate_config, clean_id
+from tinytoolslib.models import LK_HW_40
 
 from .const import DOMAIN
 
+# Same as in homeassistant.components.mqtt (not imported until needed).
+MQTT_DOMAIN = "mqtt"
+CONF_DISCOVERY_PREFIX = "discovery_prefix"
 
 # For now only one device_model - LK4, others might be added as separate actions,
 # so the schema is clean, also note that services.yaml keeps options of series.
+# Series are validated against LK4_SERIES when action is called.
 ADD_MQTT_DEVICE_SCHEMA = vol.Schema(
     {
         vol.Required("device_name"): cv.string,
-        vol.Required("device_model"): vol.In([LK4_MODEL]),
+        vol.Required("device_model"): vol.In([LK_HW_40.info.model]),
         vol.Required("serial_number"): cv.string,
         vol.Required("hw_version"): cv.string,
         vol.Required("sw_version"): cv.string,
         vol.Required("topic_prefix"): cv.string,
-        vol.Required("series"): vol.All(
-            [vol.In([item["name"] for item in LK4_SERIES])], vol.Length(min=1)
-        ),
+        vol.Required("series"): vol.All([cv.string], vol.Length(min=1)),
         vol.Optional(
             "discovery_prefix"
         ): cv.string,  # fallback to MQTT option or "homeassistant"
@@ -65,6 +66,10 @@ async def async_setup_services(hass: HomeAssistant):
             if not hass.config_entries.async_entries(MQTT_DOMAIN):
                 # Give a clear error if MQTT isn't set up
                 raise HomeAssistantError("MQTT is not set up in Home Assistant")
+            mqtt = await async_import_module(hass, "homeassistant.components.mqtt")
+            mqtt_integration = await async_import_module(
+                hass, f"{__package__}.mqtt_integration"
+            )
             data = dict(call.data)
             device_name = data["device_name"]
             device_model = data["device_model"]
@@ -73,12 +78,17 @@ async def async_setup_services(hass: HomeAssistant):
             sw = data["sw_version"]
             topic_prefix = data["topic_prefix"].rstrip("/")
             series: Iterable[str] = data["series"]
+            known_series = {item["name"] for item in mqtt_integration.LK4_SERIES}
+            if unknown := set(series) - known_series:
+                raise HomeAssistantError(
+                    f"Unknown series: {', '.join(sorted(unknown))}"
+                )
             discovery_prefix = (
                 data.get("discovery_prefix") or _get_mqtt_discovery_prefix()
             )
 
             # Build set of messages and send them
-            mqtt_config = generate_config(
+            mqtt_config = mqtt_integration.generate_config(
                 device_name, device_model, serial, hw, sw, topic_prefix, series
             )
             for config_item in mqtt_config:
@@ -86,7 +96,7 @@ async def async_setup_services(hass: HomeAssistant):
                     # Actually there is only one iteration in this loop, because each config_item
                     # is a dict describing single entry.
                     # Ensure that object_id has valid format.
-                    object_id = clean_id(entity_val["name"])
+                    object_id = mqtt_integration.clean_id(entity_val["name"])
                     await mqtt.async_publish(
                         hass,
                         f"{discovery_prefix}/{component}/{object_id}/{entity_val['unique_id']}/config",
@@ -17,9 +17,9 @@ from homeassistant.helpers.entity_platform import AddEntitiesCallback
 
 from tinytoolslib.models import DeviceModel
 
-from .const import DOMAIN
+from .const import DOMAIN, POLL_GROUP_NORMAL
 from .coordinator import TinycontrolData, TinycontrolCoordinator, TinyToolsError
-from .entity import TinycontrolEntity
+from .entity import TinycontrolEntity, async_add_dynamic_entities
 
 
 @dataclass(frozen=True, kw_only=True)
@@ -27,6 +27,7 @@ class TinycontrolSwitchEntityDescription(SwitchEntityDescription):
     """Class describing Tinycontrol switch entities."""
 
     entity_registry_enabled_default: bool = False
+    poll_group: str = POLL_GROUP_NORMAL
     has_fn: Callable[[TinycontrolData], bool] = lambda _: True
     is_on_fn: Callable[[TinycontrolData], bool | None]
     set_fn: Callable[[DeviceModel, bool], Awaitable[Any]]
@@ -88,13 +89,8 @@ async def async_setup_entry(
     """Set up tinycontrol switch based on a config entry."""
     coordinator: TinycontrolCoordinator = hass.data[DOMAIN][entry.entry_id]
 
-    async_add_entities(
-        TinycontrolSwitchEntity(
-            coordinator=coordinator,
-            description=description,
-        )
-        for description in SWITCHES
-        if description.has_fn(coordinator.data)
+    async_add_dynamic_entities(
+        coordinator, async_add_entities, SWITCHES, TinycontrolSwitchEntity
     )
 
 
@@ -122,7 +118,7 @@ class TinycontrolSwitchEntity(TinycontrolEntity, SwitchEntity):
     async def async_turn_on(self, **kwargs: Any) -> None:
         """Turn the entity on."""
         try:
-            await self.entity_description.set_fn(self.coordinator.client, 1)
+            await self.coordinator.async_send_command(self.entity_description.set_fn, 1)
         except TinyToolsError as error:
             raise HomeAssistantError(
                 "An error occurred while updating the tinycontrol"
@@ -133,7 +129,7 @@ class TinycontrolSwitchEntity(TinycontrolEntity, SwitchEntity):
     async def async_turn_off(self, **kwargs: Any) -> None:
         """Turn the entity off."""
         try:
-            await self.entity_description.set_fn(self.coordinator.client, 0)
+            await self.coordinator.async_send_command(self.entity_description.set_fn, 0)
         except TinyToolsError as error:
             raise HomeAssistantError(
                 "An error occurred while updating the tinycontrol"
@@ -0,0 +1,100 @@
+"""Transforms of custom readings (mX, diffX) configured in options.
+
+Custom readings are published by device raw, eg. voltage of sensor instead of
+humidity. Transform scales and clamps value (value * scale + offset, limited to
+min/max) and sets unit, device class and state class of its sensor, so no
+template sensors are needed on top of them. Transforms are compiled once, when
+coordinator is created, and applied to every read of device in a single pass.
+"""
+
+from dataclasses import dataclass
+from typing import Any
+
+from homeassistant.components.sensor import SensorDeviceClass, SensorStateClass
+
+TRANSFORM_SCALE = "scale"
+TRANSFORM_OFFSET = "offset"
+TRANSFORM_MIN = "min"
+TRANSFORM_MAX = "max"
+TRANSFORM_UNIT = "unit"
+TRANSFORM_DEVICE_CLASS = "device_class"
+TRANSFORM_STATE_CLASS = "state_class"
+
+# Readings that can be transformed.
+TRANSFORM_KEYS = frozenset(
+    [*(f"mValue{i}" for i in range(1, 31)), *(f"diff{i}" for i in range(1, 7))]
+)
+
+
+@dataclass(slots=True, frozen=True)
+class Transform:
+    """Transform of a single reading."""
+
+    key: str
+    scale: float
+    offset: float
+    min: float | None
+    max: float | None
+    unit: str | None
+    device_class: SensorDeviceClass | None
+    state_class: SensorStateClass | None
+
+
+def _optional_float(value: Any) -> float | None:
+    return None if value is None else float(value)
+
+
+def parse_transform(key: str, transform: dict[str, Any]) -> Transform:
+    """Parse transform from options (raises ValueError/TypeError when it's invalid)."""
+    if key not in TRANSFORM_KEYS:
+        raise ValueError(f"Reading {key} can't be transformed")
+    if not isinstance(transform, dict):
+        raise TypeError("Transform must be a mapping")
+    device_class = transform.get(TRANSFORM_DEVICE_CLASS)
+    state_class = transform.get(TRANSFORM_STATE_CLASS)
+    return Transform(
+        key=key,
+        scale=float(transform.get(TRANSFORM_SCALE, 1)),
+        offset=float(transform.get(TRANSFORM_OFFSET, 0)),
+        min=_optional_float(transform.get(TRANSFORM_MIN)),
+        max=_optional_float(transform.get(TRANSFORM_MAX)),
+        unit=transform.get(TRANSFORM_UNIT),
+        device_class=None if device_class is None else SensorDeviceClass(device_class),
+        state_class=None if state_class is None else SensorStateClass(state_class),
+    )
+
+
+class TinycontrolTransforms:
+    """Compiled transforms of readings of a single device."""
+
+    def __init__(self, transforms: dict[str, dict[str, Any]]) -> None:
+        self.transforms = {
+            key: parse_transform(key, transform)
+            for key, transform in transforms.items()
+        }
+        # Only transforms that change value, as plain tuples for fast loop.
+        self._compiled = tuple(
+            (
+                transform.key,
+                transform.scale,
+                transform.offset,
+                -float("inf") if transform.min is None else transform.min,
+                float("inf") if transform.max is None else transform.max,
+            )
+            for transform in self.transforms.values()
+            if transform.scale != 1
+            or transform.offset
+            or transform.min is not None
+            or transform.max is not None
+        )
+
+    def apply(self, data: dict) -> dict:
+        """Return data read from device with transformed values."""
+        if not self._compiled:
+            return data
+        data = dict(data)
+        for key, scale, offset, low, high in self._compiled:
+            value = data.get(key)
+            if isinstance(value, (int, float)) and not isinstance(value, bool):
+                data[key] = min(max(value * scale + offset, low), high)
+        return data
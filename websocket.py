@@ -0,0 +1,181 @@
+"""Websocket API streaming readings of tinycontrol devices.
+
+Command tinycontrol/subscribe sends current readings of chosen devices (all
+devices by default, including ones set up later) and then only readings that
+changed with every update of device, straight from coordinators. Current
+readings are sent again when device is reloaded (eg. after options change). It's meant
+for dashboards showing high-rate readings, which don't need to go through
+state machine and recorder.
+"""
+
+from fnmatch import fnmatchcase
+from functools import partial
+from typing import Any
+
+import voluptuous as vol
+
+from homeassistant.components import websocket_api
+from homeassistant.const import ATTR_STATE, CONF_MAC
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import CONF_KEYS, DOMAIN, SIGNAL_COORDINATORS_CHANGED
+from .coordinator import TinycontrolCoordinator, async_get_coordinators
+
+WEBSOCKET_KEY = f"{DOMAIN}_websocket"
+ATTR_DEVICE_IDS = "device_ids"
+ATTR_DELTA = "delta"
+
+
+class TinycontrolSubscription:
+    """Subscription of websocket connection to readings of devices."""
+
+    def __init__(
+        self,
+        connection: websocket_api.ActiveConnection,
+        msg_id: int,
+        entry_ids: set[str] | None,
+        keys: list[str] | None,
+    ) -> None:
+        self._connection = connection
+        self._msg_id = msg_id
+        # Config entries of chosen devices (None - all devices).
+        self._entry_ids = entry_ids
+        self._keys = keys
+        # Whether key matches any of keys (patterns) of subscription.
+        self._matches: dict[str, bool] = {}
+        self._subscribed: dict[str, tuple[TinycontrolCoordinator, CALLBACK_TYPE]] = {}
+
+    def _filter(self, readings: dict) -> dict:
+        """Return readings with keys of subscription."""
+        if self._keys is None:
+            return readings
+        filtered = {}
+        for key, value in readings.items():
+            if (matches := self._matches.get(key)) is None:
+                matches = self._matches[key] = any(
+                    fnmatchcase(key, pattern) for pattern in self._keys
+                )
+            if matches:
+                filtered[key] = value
+        return filtered
+
+    @callback
+    def _async_add(self, coordinator: TinycontrolCoordinator) -> None:
+        """Send current readings of device and subscribe to their changes."""
+        mac = coordinator.data.mac
+        self._connection.send_message(
+            websocket_api.event_message(
+                self._msg_id,
+                {CONF_MAC: mac, ATTR_STATE: self._filter(coordinator.data.state)},
+            )
+        )
+        self._subscribed[coordinator.config_entry.entry_id] = (
+            coordinator,
+            coordinator.async_add_delta_listener(partial(self._async_send_delta, mac)),
+        )
+
+    @callback
+    def _async_send_delta(self, mac: str, delta: dict) -> None:
+        if delta := self._filter(delta):
+            self._connection.send_message(
+                websocket_api.event_message(
+                    self._msg_id, {CONF_MAC: mac, ATTR_DELTA: delta}
+                )
+            )
+
+    @callback
+    def async_update(self, hass: HomeAssistant) -> None:
+        """Follow coordinators of chosen devices (eg. after reload of entry)."""
+        coordinators = {
+            coordinator.config_entry.entry_id: coordinator
+            for coordinator in async_get_coordinators(hass)
+            if coordinator.data is not None
+            and (
+                self._entry_ids is None
+                or coordinator.config_entry.entry_id in self._entry_ids
+            )
+        }
+        # Forget coordinators that were unloaded (or replaced by reload).
+        for entry_id, (coordinator, unsub) in list(self._subscribed.items()):
+            if coordinators.get(entry_id) is not coordinator:
+                unsub()
+                del self._subscribed[entry_id]
+        for entry_id, coordinator in coordinators.items():
+            if entry_id not in self._subscribed:
+                self._async_add(coordinator)
+
+    @callback
+    def async_unsubscribe(self) -> None:
+        """Unsubscribe from all devices."""
+        for _, unsub in self._subscribed.values():
+            unsub()
+        self._subscribed.clear()
+
+
+@websocket_api.websocket_command(
+    {
+        vol.Required("type"): f"{DOMAIN}/subscribe",
+        vol.Optional(ATTR_DEVICE_IDS): [str],
+        vol.Optional(CONF_KEYS): [str],
+    }
+)
+@callback
+def websocket_subscribe(
+    hass: HomeAssistant,
+    connection: websocket_api.ActiveConnection,
+    msg: dict[str, Any],
+) -> None:
+    """Stream readings of devices (current ones and then their changes)."""
+    entry_ids: set[str] | None = None
+    if ATTR_DEVICE_IDS in msg:
+        coordinator_entry_ids = {
+            coordinator.config_entry.entry_id
+            for coordinator in async_get_coordinators(hass)
+        }
+        device_registry = dr.async_get(hass)
+        entry_ids = set()
+        for device_id in msg[ATTR_DEVICE_IDS]:
+            device = device_registry.async_get(device_id)
+            entry_id = next(
+                (
+                    entry_id
+                    for entry_id in (device.config_entries if device else ())
+                    if entry_id in coordinator_entry_ids
+                ),
+                None,
+            )
+            if entry_id is None:
+                connection.send_error(
+                    msg["id"],
+                    websocket_api.ERR_NOT_FOUND,
+                    f"Device {device_id} is not a set up tinycontrol device",
+                )
+                return
+            entry_ids.add(entry_id)
+    subscription = TinycontrolSubscription(
+        connection, msg["id"], entry_ids, msg.get(CONF_KEYS)
+    )
+    # Follow devices that are set up, reloaded or removed later.
+    unsub_coordinators = async_dispatcher_connect(
+        hass, SIGNAL_COORDINATORS_CHANGED, partial(subscription.async_update, hass)
+    )
+
+    @callback
+    def async_unsubscribe() -> None:
+        unsub_coordinators()
+        subscription.async_unsubscribe()
+
+    connection.subscriptions[msg["id"]] = async_unsubscribe
+    connection.send_result(msg["id"])
+    subscription.async_update(hass)
+
+
+@callback
+def async_setup_websocket(hass: HomeAssistant) -> None:
+    """Register websocket commands (once)."""
+    if WEBSOCKET_KEY in hass.data:
+        return
+    websocket_api.async_register_command(hass, websocket_subscribe)
+    hass.data[WEBSOCKET_KEY] = True
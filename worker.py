@@ -0,0 +1,165 @@
+"""Reading devices in worker thread.
+
+With hundreds of devices and short intervals, requests and parsing of
+responses take noticeable time of Home Assistant event loop. In worker mode
+reads of device (I/O and parsing) are run by event loop of a separate thread
+(shared by all devices in this mode, with its own HTTP session) and only
+changed values are passed back to coordinator, which merges them into its
+data. Commands are still sent from main event loop.
+"""
+
+import asyncio
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
+from dataclasses import replace
+from itertools import count
+from typing import Any, TypeVar
+
+from aiohttp import ClientSession
+
+from homeassistant.core import HomeAssistant
+
+from tinytoolslib.models import DeviceModel
+
+from .const import DOMAIN
+
+_T = TypeVar("_T")
+
+WORKER_KEY = f"{DOMAIN}_worker"
+
+
+class TinycontrolWorker:
+    """Event loop in a separate thread running reads of devices."""
+
+    def __init__(self) -> None:
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(
+            target=self._run, name=f"{DOMAIN}_worker", daemon=True
+        )
+        self.session: ClientSession | None = None
+        self.users = 0
+        self._start_task: asyncio.Task[None] | None = None
+
+    def _run(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+        self._loop.close()
+
+    async def _async_create_session(self) -> ClientSession:
+        return ClientSession()
+
+    async def _async_start(self) -> None:
+        self._thread.start()
+        self.session = await self.async_run(self._async_create_session())
+
+    async def async_wait_started(self) -> None:
+        """Start thread with event loop and HTTP session (once) and wait for it.
+
+        Start is shared, so devices set up concurrently get the session only
+        when it's ready.
+        """
+        if self._start_task is None:
+            self._start_task = asyncio.ensure_future(self._async_start())
+        await asyncio.shield(self._start_task)
+
+    async def async_run(self, coro: Coroutine[Any, Any, _T]) -> _T:
+        """Run coroutine in worker and wait for its result.
+
+        Cancelling the wait cancels the coroutine in worker as well.
+        """
+        return await asyncio.wrap_future(
+            asyncio.run_coroutine_threadsafe(coro, self._loop)
+        )
+
+    async def async_stop(self, hass: HomeAssistant) -> None:
+        """Close HTTP session and stop thread."""
+        if self._start_task is not None and not self._start_task.done():
+            self._start_task.cancel()
+        if not self._thread.is_alive():
+            self._loop.close()
+            return
+        if self.session is not None:
+            await self.async_run(self.session.close())
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        await hass.async_add_executor_job(self._thread.join)
+
+
+async def async_acquire_worker(hass: HomeAssistant) -> TinycontrolWorker:
+    """Return worker shared by devices (started with the first of them)."""
+    if (worker := hass.data.get(WORKER_KEY)) is None:
+        worker = hass.data[WORKER_KEY] = TinycontrolWorker()
+    worker.users += 1
+    try:
+        await worker.async_wait_started()
+    except BaseException:
+        await async_release_worker(hass, worker)
+        raise
+    return worker
+
+
+async def async_release_worker(hass: HomeAssistant, worker: TinycontrolWorker) -> None:
+    """Release worker (it's stopped when no device uses it)."""
+    worker.users -= 1
+    if worker.users == 0 and hass.data.get(WORKER_KEY) is worker:
+        del hass.data[WORKER_KEY]
+        await worker.async_stop(hass)
+
+
+class TinycontrolWorkerDevice:
+    """Client of a single device running reads in worker.
+
+    Worker keeps the last data of every read (eg. URL) and returns only its
+    changes against data that coordinator has. Data are versioned, so when
+    coordinator didn't get a response (eg. read was cancelled), the next one
+    carries full data.
+    """
+
+    def __init__(self, worker: TinycontrolWorker, client: DeviceModel) -> None:
+        self._worker = worker
+        self._main_client = client
+        # Separate client, so its session and parsing context belong to worker.
+        self._client = replace(client, session=worker.session)
+        self._versions = count(1)
+        # Last data of reads in worker and in coordinator, with their versions.
+        self._sent: dict[str, tuple[int, dict]] = {}
+        self._received: dict[str, tuple[int, dict]] = {}
+
+    async def _async_read_changes(
+        self,
+        key: str,
+        read_fn: Callable[[DeviceModel], Awaitable[dict]],
+        base_version: int | None,
+    ) -> tuple[int, dict, list[str] | None]:
+        """Read device in worker and return changes of data (None - full data)."""
+        if self._client.software_version != self._main_client.software_version:
+            # Coordinator has updated client after firmware upgrade.
+            self._client = replace(self._main_client, session=self._worker.session)
+        data = await read_fn(self._client)
+        version = next(self._versions)
+        sent_version, sent = self._sent.get(key, (None, {}))
+        self._sent[key] = (version, data)
+        if base_version is None or sent_version != base_version:
+            return version, data, None
+        changes = {
+            key: value
+            for key, value in data.items()
+            if key not in sent or sent[key] != value
+        }
+        return version, changes, [key for key in sent if key not in data]
+
+    async def async_read(
+        self, key: str, read_fn: Callable[[DeviceModel], Awaitable[dict]]
+    ) -> dict:
+        """Read device in worker and return full data of the read."""
+        base_version, received = self._received.get(key, (None, {}))
+        version, changes, removed = await self._worker.async_run(
+            self._async_read_changes(key, read_fn, base_version)
+        )
+        if removed is None:
+            data = changes
+        else:
+            data = {**received, **changes}
+            for removed_key in removed:
+                del data[removed_key]
+        self._received[key] = (version, data)
+        return data